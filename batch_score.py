@@ -0,0 +1,129 @@
+"""Batch pricing of AB_NYC_2019-shaped listing files.
+
+The file is read in fixed-size chunks; each chunk goes through the stored
+FeaturePipeline and is scored with one vectorized predict call, and results
+are appended to the output as they arrive, so memory stays bounded by
+chunksize x workers:
+
+    python batch_score.py listings.csv predictions.parquet --chunksize 50000 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from model_store import ARTIFACT_DIR, load_artifact, predict_prices, read_meta
+
+_worker_artifact = None
+
+
+def _init_worker(artifact_dir):
+    global _worker_artifact
+    _worker_artifact = load_artifact(artifact_dir)
+    # Paralellik süreç düzeyinde; her süreç tek çekirdekte tahmin yapar.
+    _worker_artifact["model"].n_jobs = 1
+
+
+def _score_chunk(chunk, keep_columns):
+    out = chunk[keep_columns].copy() if keep_columns else pd.DataFrame(index=chunk.index)
+    out["predicted_price"] = predict_prices(_worker_artifact, chunk)
+    return out
+
+
+def score_chunks(chunks, artifact_dir=ARTIFACT_DIR, workers=1, keep_columns=None):
+    """Yield scored chunks in input order, with at most 2 x workers chunks in flight."""
+    if workers <= 1:
+        _init_worker(artifact_dir)
+        for chunk in chunks:
+            yield _score_chunk(chunk, keep_columns)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(artifact_dir,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_chunk, chunk, keep_columns))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_sink(path):
+    if path.endswith(".parquet"):
+        return _ParquetSink(path)
+    return _CsvSink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV dosyasındaki ilanları parça parça fiyatlandırır.")
+    parser.add_argument("input", help="AB_NYC_2019 formatında CSV dosyası")
+    parser.add_argument("output", help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--keep-columns", default="id",
+                        help="Çıktıya kopyalanacak girdi sütunları, virgülle ayrılmış")
+    args = parser.parse_args()
+
+    if read_meta(args.artifact_dir) is None:
+        sys.exit(f"{args.artifact_dir} içinde model bulunamadı; önce 'python model_store.py' çalıştırın.")
+
+    header = pd.read_csv(args.input, nrows=0).columns
+    keep_columns = [c for c in args.keep_columns.split(",") if c and c in header]
+
+    chunks = pd.read_csv(args.input, chunksize=args.chunksize)
+    sink = open_sink(args.output)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for scored in score_chunks(chunks, args.artifact_dir, args.workers, keep_columns):
+            sink.write(scored)
+            rows += len(scored)
+            elapsed = time.perf_counter() - start
+            print(f"{rows} satır, {rows / elapsed:,.0f} satır/s", file=sys.stderr)
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Tamamlandı: {rows} satır {elapsed:.1f} s içinde ({rows / max(elapsed, 1e-9):,.0f} satır/s) -> "
+          f"{os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Incremental refresh vs. full retrain.
+
+The dataset is split into a held-out test set, an initial history and a
+sequence of daily deltas. After each delta the model is both refreshed
+incrementally and retrained from scratch on all rows seen so far, and the
+time and test MAE of each are reported:
+
+    python -m benchmarks.incremental --data AB_NYC_2019.csv --days 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from data_cache import load_dataset
+from incremental import refresh_artifact
+from model_store import RF_PARAMS, predict_prices, train_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artımlı güncelleme ile tam yeniden eğitimi karşılaştırır.")
+    parser.add_argument("--data", default="AB_NYC_2019.csv")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--delta-fraction", type=float, default=0.02, help="Her günün veri payı")
+    parser.add_argument("--new-trees", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df = load_dataset(args.data).sample(frac=1.0, random_state=args.seed).reset_index(drop=True)
+    n_test = len(df) // 10
+    test, rest = df.iloc[:n_test], df.iloc[n_test:]
+    test = test[test["price"] > 0]
+    delta_size = int(len(df) * args.delta_fraction)
+    history_size = len(rest) - args.days * delta_size
+
+    history = rest.iloc[:history_size]
+    artifact = train_artifact(history, RF_PARAMS)
+    print(f"Başlangıç: {len(history)} satır, test MAE "
+          f"{mean_absolute_error(test['price'], predict_prices(artifact, test)):.2f}")
+    print(f"{'gün':>4} {'artımlı s':>10} {'artımlı MAE':>12} {'tam s':>8} {'tam MAE':>9}")
+
+    rows = []
+    for day in range(args.days):
+        delta = rest.iloc[history_size + day * delta_size:history_size + (day + 1) * delta_size]
+        seen = rest.iloc[:history_size + (day + 1) * delta_size]
+
+        start = time.perf_counter()
+        refresh_artifact(artifact, delta, args.new_trees)
+        incremental_s = time.perf_counter() - start
+        incremental_mae = mean_absolute_error(test["price"], predict_prices(artifact, test))
+
+        start = time.perf_counter()
+        full = train_artifact(seen, RF_PARAMS)
+        full_s = time.perf_counter() - start
+        full_mae = mean_absolute_error(test["price"], predict_prices(full, test))
+
+        rows.append((day + 1, incremental_s, incremental_mae, full_s, full_mae))
+        print(f"{day + 1:>4} {incremental_s:>10.2f} {incremental_mae:>12.2f} {full_s:>8.2f} {full_mae:>9.2f}")
+
+    result = pd.DataFrame(rows, columns=["day", "incremental_s", "incremental_mae", "full_s", "full_mae"])
+    print(f"Ortalama hızlanma: {np.mean(result['full_s'] / result['incremental_s']):.1f}x, "
+          f"MAE farkı: {np.mean(result['incremental_mae'] - result['full_mae']):+.2f}")
+
+
+if __name__ == "__main__":
+    main()
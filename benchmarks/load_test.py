@@ -0,0 +1,332 @@
+"""Concurrent-session load test of the Streamlit app.
+
+Simulates N analysts at once: every session is a streamlit.testing AppTest
+running app.py in this process, so sessions share the Streamlit caches and
+the background job scheduler exactly as they do on a real server. Each
+session opens random sidebar pages, waits for background training to finish
+(rerunning every --poll seconds, as the progress fragment does), and on
+"Fiyat Tahmin" changes the inputs, asks for a prediction and runs a what-if
+sweep. Between actions it thinks for an exponentially distributed time.
+
+Reported: rerun latency percentiles per page and action, time until pages
+backed by training jobs show their result, CPU use of the process relative
+to all cores (and how often it was saturated) and RSS growth:
+
+    python -m benchmarks.load_test --data-dir /path/with/csv --sessions 8 --duration 60
+    python -m benchmarks.load_test --data-dir /path/with/csv --out after.json --compare before.json
+
+--cold runs against a copy of the CSV in a temporary directory, so the
+Feather cache and the model artifacts are rebuilt under load; otherwise the
+existing ones in --data-dir are used.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.run import environment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sonucu arka plan işine bağlı sayfalar; hazır olana kadar yoklanır
+JOB_PAGES = ("Model Sonuçları", "Fiyat Tahmin")
+SWEEP_CHOICES = (["availability_365"], ["minimum_nights", "room_type"], ["availability_365", "number_of_reviews"])
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+class ResourceSampler(threading.Thread):
+    """Samples process CPU use (fraction of all cores) and RSS every interval seconds."""
+
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.cpu = []
+        self.rss = [_rss_mb()]
+        self._stop_event = threading.Event()
+
+    def run(self):
+        cores = os.cpu_count() or 1
+        last_wall, last_cpu = time.perf_counter(), sum(os.times()[:2])
+        while not self._stop_event.wait(self.interval):
+            wall, cpu = time.perf_counter(), sum(os.times()[:2])
+            self.cpu.append((cpu - last_cpu) / (wall - last_wall) / cores)
+            self.rss.append(_rss_mb())
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.rss.append(_rss_mb())
+
+    def summary(self, saturated=0.9):
+        cpu = np.array(self.cpu) if self.cpu else np.zeros(1)
+        return {
+            "cpu_mean": float(cpu.mean()),
+            "cpu_p95": float(np.percentile(cpu, 95)),
+            "cpu_saturated": float((cpu >= saturated).mean()),
+            "rss_start_mb": self.rss[0],
+            "rss_peak_mb": max(self.rss),
+            "rss_end_mb": self.rss[-1],
+            "rss_growth_mb": self.rss[-1] - self.rss[0],
+        }
+
+
+class Session:
+    """One simulated analyst driving its own AppTest."""
+
+    def __init__(self, app_path, session_id, seed, stats, lock, poll=1.0, think=1.0, timeout=600):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(app_path, default_timeout=timeout)
+        self.id = session_id
+        self.rng = np.random.default_rng([seed, session_id])
+        self.stats = stats
+        self.lock = lock
+        self.poll = poll
+        self.think = think
+        self.errors = []
+
+    def _rerun(self, page, action, step=None):
+        """Apply step (a widget change) and rerun, recording the latency under (page, action)."""
+        start = time.perf_counter()
+        if step is None:
+            self.at.run()
+        else:
+            step().run()
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.stats[(page, action)].append(seconds)
+        if self.at.exception:
+            self.errors.append(f"{page}/{action}: {self.at.exception[0].value}")
+        return seconds
+
+    def _waiting(self):
+        # Arka plan işi sürerken sayfa ilerleme çubuğu gösterir
+        return bool(self.at.get("progress"))
+
+    def _widget(self, kind, label):
+        return next((w for w in getattr(self.at, kind) if w.label.startswith(label)), None)
+
+    def open_page(self, page):
+        start = time.perf_counter()
+        self._rerun(page, "open", lambda: self.at.sidebar.radio[0].set_value(page))
+        if page in JOB_PAGES:
+            while self._waiting():
+                time.sleep(self.poll)
+                self._rerun(page, "poll")
+            with self.lock:
+                self.stats[(page, "ready")].append(time.perf_counter() - start)
+
+    def predict(self):
+        page = "Fiyat Tahmin"
+        if self._widget("number_input", "Latitude") is None:
+            return
+        # Her yeniden çalıştırmadan sonra widget'lar yeni ağaçtan alınır
+        lat, lon = 40.7 + self.rng.normal(0, 0.05), -73.95 + self.rng.normal(0, 0.05)
+        nights = int(self.rng.integers(1, 15))
+        self._rerun(page, "input", lambda: self._widget("number_input", "Latitude").set_value(round(lat, 4)))
+        self._rerun(page, "input", lambda: self._widget("number_input", "Longitude").set_value(round(lon, 4)))
+        self._rerun(page, "input", lambda: self._widget("number_input", "Minimum").set_value(nights))
+        self._rerun(page, "predict", lambda: self._widget("button", "Tahmini").click())
+        if self._widget("multiselect", "Değiştirilecek") is not None:
+            choice = list(SWEEP_CHOICES[int(self.rng.integers(len(SWEEP_CHOICES)))])
+            self._rerun(page, "sweep", lambda: self._widget("multiselect", "Değiştirilecek").set_value(choice))
+            self._rerun(page, "sweep", lambda: self._widget("multiselect", "Değiştirilecek").set_value([]))
+
+    def run(self, pages, stop_at):
+        self._rerun("Ana Sayfa", "start")
+        while time.perf_counter() < stop_at:
+            page = pages[int(self.rng.integers(len(pages)))]
+            self.open_page(page)
+            if page == "Fiyat Tahmin":
+                self.predict()
+            time.sleep(self.rng.exponential(self.think))
+
+
+def _allow_concurrent_apptests():
+    """Let AppTests run concurrently in one process.
+
+    Every AppTest run installs its own mock Runtime singleton and clears it
+    when the run ends, which breaks the scripts of the other sessions still
+    running, so Runtime.instance() is made to fall back to the last mock seen.
+    Each run also parses app.py again, and ast.parse is not thread-safe on
+    every Python version, so script compilation is serialized (a real server
+    compiles the script once and shares the bytecode).
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        if not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+
+    get_bytecode, compile_lock = ScriptCache.get_bytecode, threading.Lock()
+
+    def locked_get_bytecode(self, script_path):
+        with compile_lock:
+            return get_bytecode(self, script_path)
+
+    ScriptCache.get_bytecode = locked_get_bytecode
+
+
+def _percentiles(seconds):
+    ms = np.array(seconds) * 1000
+    return {
+        "count": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def run_load(app_path, data_dir, sessions, duration, pages, seed=42, poll=1.0, think=1.0, ramp=0.5):
+    """Run sessions concurrent sessions for duration seconds; returns the report dict.
+
+    Sessions start ramp seconds apart; the duration counts from the first.
+    """
+    _allow_concurrent_apptests()
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    sys.path.insert(0, os.path.dirname(app_path))
+    stats, lock, errors = defaultdict(list), threading.Lock(), []
+    sampler = ResourceSampler()
+    sampler.start()
+    start = time.perf_counter()
+    stop_at = start + duration
+
+    def session(i):
+        time.sleep(i * ramp)
+        s = Session(app_path, i, seed, stats, lock, poll=poll, think=think)
+        try:
+            s.run(pages, stop_at)
+        except Exception as e:
+            s.errors.append(f"{type(e).__name__}: {e}")
+        with lock:
+            errors.extend(f"oturum {i}: {err}" for err in s.errors)
+
+    threads = [threading.Thread(target=session, args=(i,), name=f"session-{i}") for i in range(sessions)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sampler.stop()
+        os.chdir(cwd)
+    elapsed = time.perf_counter() - start
+    reruns = sum(len(v) for key, v in stats.items() if key[1] != "ready")
+    return {
+        "sessions": sessions,
+        "duration_s": elapsed,
+        "reruns": reruns,
+        "reruns_per_s": reruns / elapsed,
+        "errors": errors,
+        "resources": sampler.summary(),
+        "latency": [{"page": page, "action": action, **_percentiles(v)} for (page, action), v in sorted(stats.items())],
+    }
+
+
+def _report(result):
+    print(f"\n{'sayfa':<24} {'eylem':<8} {'adet':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for r in result["latency"]:
+        print(f"{r['page'][:24]:<24} {r['action']:<8} {r['count']:>6} {r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f} "
+              f"{r['p99_ms']:>9.0f} {r['max_ms']:>9.0f}")
+    res = result["resources"]
+    print(f"\n{result['sessions']} oturum, {result['duration_s']:.0f} s, {result['reruns']} yeniden çalıştırma "
+          f"({result['reruns_per_s']:.1f}/s), {len(result['errors'])} hata")
+    print(f"CPU ortalama %{res['cpu_mean'] * 100:.0f}, p95 %{res['cpu_p95'] * 100:.0f}, "
+          f"doygun zaman %{res['cpu_saturated'] * 100:.0f} ({os.cpu_count()} çekirdek)")
+    print(f"RSS {res['rss_start_mb']:.0f} -> {res['rss_end_mb']:.0f} MB (tepe {res['rss_peak_mb']:.0f}, "
+          f"artış {res['rss_growth_mb']:+.0f} MB)")
+    for err in result["errors"][:5]:
+        print(f"  hata: {err}")
+
+
+def compare(result, baseline, threshold):
+    """Print p95 ratios per (page, action) against a baseline run; returns the regressed pairs."""
+    before = {(r["page"], r["action"]): r for r in baseline["result"]["latency"]}
+    regressions = []
+    print(f"\n{'sayfa':<24} {'eylem':<8} {'önce p95':>10} {'sonra p95':>10} {'oran':>7}")
+    for r in result["latency"]:
+        old = before.get((r["page"], r["action"]))
+        if old is None or not old["p95_ms"]:
+            continue
+        ratio = r["p95_ms"] / old["p95_ms"]
+        flag = " !" if ratio > 1 + threshold else ""
+        print(f"{r['page'][:24]:<24} {r['action']:<8} {old['p95_ms']:>10.0f} {r['p95_ms']:>10.0f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append((r["page"], r["action"]))
+    growth, old_growth = result["resources"]["rss_growth_mb"], baseline["result"]["resources"]["rss_growth_mb"]
+    print(f"RSS artışı {old_growth:+.0f} -> {growth:+.0f} MB")
+    return regressions
+
+
+def main():
+    from views import PAGES
+
+    parser = argparse.ArgumentParser(description="Eşzamanlı oturumlarla Streamlit uygulamasının yük testi")
+    parser.add_argument("--data-dir", default=".", help="AB_NYC_2019.csv dosyasının bulunduğu dizin")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0, help="Saniye cinsinden test süresi")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--think", type=float, default=1.0, help="Eylemler arası ortalama bekleme (s)")
+    parser.add_argument("--poll", type=float, default=1.0, help="Eğitim sürerken yeniden çalıştırma aralığı (s)")
+    parser.add_argument("--ramp", type=float, default=0.5, help="Oturumların başlangıç aralığı (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cold", action="store_true", help="Önbellek ve model olmadan, geçici dizinde başla")
+    parser.add_argument("--out", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Gerileme sayılan p95 artış oranı")
+    args = parser.parse_args()
+
+    app_path = os.path.join(ROOT, "app.py")
+    data_dir = os.path.abspath(args.data_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.cold:
+            shutil.copy(os.path.join(data_dir, "AB_NYC_2019.csv"), tmp)
+            data_dir = tmp
+        result = run_load(app_path, data_dir, args.sessions, args.duration, args.pages, seed=args.seed,
+                          poll=args.poll, think=args.think, ramp=args.ramp)
+    _report(result)
+
+    if args.out:
+        report = {"environment": environment(), "args": vars(args), "result": result}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar yazıldı: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} eylemde p95 %{args.threshold * 100:.0f} üzeri yavaşladı.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
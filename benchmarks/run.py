@@ -0,0 +1,245 @@
+"""Benchmark suite for the data, model and map pipeline.
+
+For every dataset size a synthetic AB_NYC_2019-schema CSV is generated (and
+reused on later runs), then each stage is timed and, with --memory, its
+peak heap allocation measured with tracemalloc:
+
+    load_cold / load_warm   load_dataset without / with the Feather cache
+    preprocess              FeaturePipeline fit + preprocess_data
+    eda_sketch              one-pass summary sketch of the EDA pages
+    fit:<model>             each model in training.MODEL_SPECS
+    predict:<model>         batch prediction on the held-out 20 %
+    spatial_index           ListingIndex (BallTree) construction
+    predict_single          predict_prices latency for one listing
+    map_cluster             marker-cluster map rendered to HTML
+    map_pyramid             density grid pyramid
+    map_density             density map rendered to HTML
+
+Results are written as JSON; --compare prints the ratio to an earlier run
+and exits with status 1 when a stage got slower than --threshold allows:
+
+    python -m benchmarks.run --sizes 10000 100000 --out before.json
+    python -m benchmarks.run --sizes 10000 100000 --out after.json --compare before.json
+
+tracemalloc slows pure-Python and pandas stages several times over, so it
+is only switched on with --memory; compare runs made with the same setting.
+Every result also records the process's max RSS after the stage.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import sklearn
+from sklearn.model_selection import train_test_split
+
+from benchmarks.synthetic import write_csv
+from data_cache import load_dataset
+from forest_engine import CompactForest
+from maps import cluster_map, density_map, map_html
+from model_store import predict_prices
+from preprocessing import FeaturePipeline, preprocess_data
+from spatial import ListingIndex, build_pyramid
+from stats import DatasetSketch
+from training import MODEL_SPECS, fit_model
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+STAGES = ("load_cold", "load_warm", "preprocess", "eda_sketch", "fit", "predict", "spatial_index",
+          "predict_single", "map_cluster", "map_pyramid", "map_density")
+
+
+def _max_rss_mb():
+    # Linux'ta ru_maxrss KB, macOS'ta bayt cinsindendir
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+class StageTimer:
+    """Runs stages and collects their wall time and peak traced memory."""
+
+    def __init__(self, rows, trace=False):
+        self.rows = rows
+        self.trace = trace
+        self.results = []
+
+    def run(self, stage, fn, *args, repeat=1, **kwargs):
+        """Call fn(*args, **kwargs) repeat times; seconds are per call."""
+        if self.trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            for _ in range(repeat):
+                value = fn(*args, **kwargs)
+        finally:
+            seconds = (time.perf_counter() - start) / repeat
+            result = {"rows": self.rows, "stage": stage, "seconds": round(seconds, 6)}
+            if repeat > 1:
+                result["repeat"] = repeat
+            if self.trace:
+                result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3)
+                tracemalloc.stop()
+            result["max_rss_mb"] = round(_max_rss_mb(), 1)
+            self.results.append(result)
+            print(f"{self.rows:>9} {stage:<28} {seconds:>11.5f} s"
+                  + (f" {result['peak_mb']:>10.1f} MB" if self.trace else ""), flush=True)
+        return value
+
+
+def dataset_path(rows, seed, data_dir):
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, f"synthetic_{rows}_{seed}.csv")
+
+
+def _single_listing(df):
+    return df.iloc[[0]][["latitude", "longitude", "minimum_nights", "number_of_reviews", "reviews_per_month",
+                         "calculated_host_listings_count", "availability_365", "neighbourhood_group",
+                         "room_type"]].reset_index(drop=True)
+
+
+def run_size(rows, seed, data_dir, stages, models, trace=False, repeat_single=200):
+    """All selected stages for one dataset size; returns the list of stage results."""
+    timer = StageTimer(rows, trace)
+    path = dataset_path(rows, seed, data_dir)
+    if not os.path.exists(path):
+        timer.run("generate", write_csv, path, rows, seed)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Soğuk yükleme Feather önbelleğini de kurar; sıcak yükleme onu okur
+        if "load_cold" in stages:
+            df = timer.run("load_cold", load_dataset, path, cache_dir=cache_dir)
+        else:
+            df = load_dataset(path, cache_dir=cache_dir)
+        if "load_warm" in stages:
+            df = timer.run("load_warm", load_dataset, path, cache_dir=cache_dir)
+
+        def preprocess():
+            pipeline = FeaturePipeline().fit(df, track_stats=True)
+            return pipeline, preprocess_data(df, pipeline)
+
+        if "preprocess" in stages:
+            pipeline, (X, y, _) = timer.run("preprocess", preprocess)
+        else:
+            pipeline, (X, y, _) = preprocess()
+
+        if "eda_sketch" in stages:
+            timer.run("eda_sketch", lambda: DatasetSketch(columns=["reviews_per_month", "minimum_nights", "price"])
+                      .update(df))
+
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        # train_models'ın tek süreçli yolu gibi float32
+        X_train = np.asarray(X_train, dtype=np.float32)
+        y_train = np.asarray(y_train, dtype=np.float32)
+        X_test = np.asarray(X_test, dtype=np.float32)
+        fitted = {}
+        for name, (cls, params) in MODEL_SPECS.items():
+            if name not in models or not {"fit", "predict", "predict_single"} & set(stages):
+                continue
+            if "fit" in stages:
+                fitted[name] = timer.run(f"fit:{name}", fit_model, cls, params, X_train, y_train)[0]
+            else:
+                fitted[name] = fit_model(cls, params, X_train, y_train)[0]
+            if "predict" in stages:
+                timer.run(f"predict:{name}", fitted[name].predict, X_test)
+
+        index = None
+        if "spatial_index" in stages:
+            index = timer.run("spatial_index", ListingIndex, df)
+
+        forest = fitted.get("Random Forest")
+        if "predict_single" in stages and forest is not None:
+            artifact = {"model": forest, "engine": CompactForest.from_sklearn(forest), "pipeline": pipeline,
+                        "index": index or ListingIndex(df), "feature_columns": pipeline.feature_columns_}
+            timer.run("predict_single", predict_prices, artifact, _single_listing(df), repeat=repeat_single)
+
+        # Sentetik veri New York koordinatlarında üretilir; harita verinin ortasına açılır
+        center = [float(df["latitude"].mean()), float(df["longitude"].mean())]
+        if "map_cluster" in stages:
+            timer.run("map_cluster", lambda: map_html(cluster_map(df, center)))
+        if "map_pyramid" in stages:
+            pyramid = timer.run("map_pyramid", build_pyramid, df)
+        elif "map_density" in stages:
+            pyramid = build_pyramid(df)
+        if "map_density" in stages:
+            timer.run("map_density", lambda: map_html(density_map(pyramid[min(pyramid)], center, "count")))
+    return timer.results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print time ratios against a baseline run; returns the regressed (rows, stage) pairs."""
+    before = {(r["rows"], r["stage"]): r for r in baseline["results"]}
+    if any("peak_mb" in r for r in results) != any("peak_mb" in r for r in baseline["results"]):
+        print("Uyarı: --memory ayarı iki çalıştırmada farklı; süreler doğrudan karşılaştırılamaz.")
+    regressions = []
+    print(f"\n{'rows':>9} {'stage':<28} {'önce s':>11} {'sonra s':>11} {'oran':>7}")
+    for r in results:
+        old = before.get((r["rows"], r["stage"]))
+        if old is None or r["stage"] == "generate" or not old["seconds"]:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        flag = " !" if ratio > 1 + threshold else ""
+        print(f"{r['rows']:>9} {r['stage']:<28} {old['seconds']:>11.5f} {r['seconds']:>11.5f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append((r["rows"], r["stage"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Veri, model ve harita aşamalarını ölçekli sentetik veriyle ölçer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_SPECS), default=list(MODEL_SPECS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=os.path.join(".cache", "synthetic"))
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Gerileme sayılan yavaşlama oranı")
+    parser.add_argument("--memory", action="store_true", help="Tepe belleği tracemalloc ile ölç (süreleri uzatır)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'stage':<28} {'süre':>13}" + (f" {'tepe bellek':>13}" if args.memory else ""))
+    results = []
+    for rows in args.sizes:
+        results.extend(run_size(rows, args.seed, args.data_dir, args.stages, args.models, trace=args.memory))
+
+    report = {"environment": environment(), "seed": args.seed, "results": results}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nSonuçlar yazıldı: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} aşamada %{args.threshold * 100:.0f} üzeri yavaşlama.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Load generator for serve.py.
+
+Starts the prediction server in a subprocess (or targets --url), fires
+concurrent single-listing requests and reports throughput and latency
+percentiles. --compare runs the same load against an unbatched server
+(max batch size 1) and the configured micro-batching server:
+
+    python -m benchmarks.serve_load --concurrency 32 --duration 10 --compare
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXAMPLE_LISTING = {
+    "latitude": 40.75, "longitude": -73.98, "minimum_nights": 3, "number_of_reviews": 10,
+    "reviews_per_month": 0.5, "calculated_host_listings_count": 1, "availability_365": 180,
+    "neighbourhood_group": "Manhattan", "neighbourhood": "Midtown", "room_type": "Entire home/apt",
+}
+
+
+def load_listings(path, n=1000):
+    if not path:
+        return [EXAMPLE_LISTING]
+    import pandas as pd
+    df = pd.read_csv(path, nrows=n)
+    return json.loads(df.to_json(orient="records"))
+
+
+def _client(url, listings, stop_at, latencies, errors):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+    i = 0
+    while time.perf_counter() < stop_at:
+        body = json.dumps(listings[i % len(listings)])
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except OSError as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_load(url, listings, concurrency, duration):
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    threads = [threading.Thread(target=_client, args=(url, listings, stop_at, latencies, errors))
+               for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p95_ms": float(np.percentile(lat_ms, 95)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+    }
+
+
+def _wait_until_up(url, timeout=60):
+    parsed = urlparse(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} ayağa kalkmadı")
+
+
+def start_server(port, artifact_dir, max_batch_size, max_wait_ms):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "serve.py"), "--port", str(port), "--artifact-dir", artifact_dir,
+         "--max-batch-size", str(max_batch_size), "--max-wait-ms", str(max_wait_ms)],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(url)
+    except RuntimeError:
+        proc.terminate()
+        raise
+    return proc, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="serve.py için yük testi")
+    parser.add_argument("--url", help="Çalışan bir servis; verilmezse servis burada başlatılır")
+    parser.add_argument("--artifact-dir", default="artifacts")
+    parser.add_argument("--data", help="İstek gövdeleri için örnek ilanların alınacağı CSV")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--compare", action="store_true", help="Mikro-batch olmadan da çalıştırıp karşılaştır")
+    args = parser.parse_args()
+
+    listings = load_listings(args.data)
+    if args.url:
+        results = {args.url: run_load(args.url, listings, args.concurrency, args.duration)}
+    else:
+        configs = [("batched", args.max_batch_size, args.max_wait_ms)]
+        if args.compare:
+            configs.insert(0, ("unbatched", 1, 0.0))
+        results = {}
+        for name, batch_size, wait_ms in configs:
+            proc, url = start_server(args.port, args.artifact_dir, batch_size, wait_ms)
+            try:
+                results[name] = run_load(url, listings, args.concurrency, args.duration)
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    print(f"{'':>12} {'istek':>8} {'hata':>6} {'istek/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name[:12]:>12} {r['requests']:>8} {r['errors']:>6} {r['throughput_rps']:>10.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
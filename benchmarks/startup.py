@@ -0,0 +1,110 @@
+"""Cold-start benchmark of the Streamlit app.
+
+Every run starts a fresh interpreter that imports Streamlit, runs app.py
+once through streamlit.testing (the first paint of the default page, "Ana
+Sayfa") and reports the time to first paint, the peak RSS and which heavy
+libraries ended up imported. --rev also measures another git revision in a
+temporary worktree, for before/after comparisons:
+
+    python -m benchmarks.startup --data-dir /path/with/csv --rev HEAD~1
+
+The first run of each tree is a discarded warm-up that also builds the
+Feather cache, so the numbers do not include CSV parsing.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["sklearn", "scipy", "seaborn", "matplotlib", "folium", "joblib", "pyarrow",
+                 "streamlit.components.v1"]
+
+_CHILD = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = sys.argv[1]
+sys.path.insert(0, os.path.dirname(app))
+at = AppTest.from_file(app, default_timeout=600)
+at.run()
+painted = time.perf_counter()
+scale = 1 if sys.platform == "darwin" else 1024
+print(json.dumps({
+    "streamlit_import_s": imported - start,
+    "first_paint_s": painted - imported,
+    "total_s": painted - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20,
+    "modules": len(sys.modules),
+    "heavy": [m for m in json.loads(sys.argv[2]) if m in sys.modules],
+    "exception": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def measure(app_path, data_dir, runs):
+    """Median startup numbers of runs fresh processes (after one warm-up run)."""
+    samples = []
+    for i in range(runs + 1):
+        proc = subprocess.run([sys.executable, "-c", _CHILD, app_path, json.dumps(HEAVY_MODULES)], cwd=data_dir,
+                              capture_output=True, text=True, check=True)
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        if sample["exception"]:
+            raise RuntimeError(f"{app_path} hata verdi: {sample['exception']}")
+        if i:
+            samples.append(sample)
+    result = {key: statistics.median(s[key] for s in samples)
+              for key in ("streamlit_import_s", "first_paint_s", "total_s", "max_rss_mb", "modules")}
+    result["heavy"] = samples[-1]["heavy"]
+    return result
+
+
+def measure_revision(rev, data_dir, runs):
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        subprocess.run(["git", "worktree", "add", "--detach", tree, rev], cwd=ROOT, check=True,
+                       capture_output=True)
+        try:
+            return measure(os.path.join(tree, "app.py"), data_dir, runs)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", tree], cwd=ROOT, check=False,
+                           capture_output=True)
+
+
+def _report(label, result):
+    print(f"{label:<12} ilk çizim {result['first_paint_s']:>6.2f} s  toplam {result['total_s']:>6.2f} s  "
+          f"RSS {result['max_rss_mb']:>6.0f} MB  modül {result['modules']:>5.0f}  "
+          f"ağır: {', '.join(result['heavy']) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uygulamanın soğuk başlangıç süresini ve belleğini ölçer.")
+    parser.add_argument("--data-dir", default=".", help="AB_NYC_2019.csv dosyasının bulunduğu dizin")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rev", help="Karşılaştırılacak git revizyonu (ör. HEAD~1)")
+    parser.add_argument("--out", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    data_dir = os.path.abspath(args.data_dir)
+    results = {}
+    if args.rev:
+        results[args.rev] = measure_revision(args.rev, data_dir, args.runs)
+        _report(args.rev, results[args.rev])
+    results["çalışma"] = measure(os.path.join(ROOT, "app.py"), data_dir, args.runs)
+    _report("çalışma", results["çalışma"])
+    if args.rev:
+        before, after = results[args.rev], results["çalışma"]
+        print(f"ilk çizim {before['first_paint_s'] / after['first_paint_s']:.1f}x hızlı, "
+              f"RSS {before['max_rss_mb'] - after['max_rss_mb']:.0f} MB az")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
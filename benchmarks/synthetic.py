@@ -0,0 +1,152 @@
+"""Seeded generator of AB_NYC_2019-schema listings.
+
+Listings are scattered around real neighbourhood centres with borough and
+room-type mixes close to the 2019 NYC data. Prices are log-normal with
+borough and room-type effects, a few zero prices and a long tail; reviews,
+minimum nights and availability are similarly skewed, and listings without
+reviews have empty last_review / reviews_per_month like the original. The
+same seed always produces the same rows, in chunks, so a million-row file
+is written without holding it in memory:
+
+    python -m benchmarks.synthetic --rows 100000 --out synthetic_100k.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["id", "name", "host_id", "host_name", "neighbourhood_group", "neighbourhood", "latitude", "longitude",
+           "room_type", "price", "minimum_nights", "number_of_reviews", "last_review", "reviews_per_month",
+           "calculated_host_listings_count", "availability_365"]
+
+# (ilçe payı, fiyat çarpanı, {mahalle: (enlem, boylam)})
+BOROUGHS = {
+    "Manhattan": (0.443, 1.35, {
+        "Harlem": (40.8116, -73.9465), "Upper West Side": (40.7870, -73.9754), "Hell's Kitchen": (40.7638, -73.9918),
+        "East Village": (40.7265, -73.9815), "Upper East Side": (40.7736, -73.9566), "Midtown": (40.7549, -73.9840),
+        "East Harlem": (40.7957, -73.9389), "Chelsea": (40.7465, -74.0014), "Lower East Side": (40.7150, -73.9843),
+        "Washington Heights": (40.8417, -73.9394), "West Village": (40.7358, -74.0036),
+        "Financial District": (40.7075, -74.0113),
+    }),
+    "Brooklyn": (0.411, 1.0, {
+        "Williamsburg": (40.7081, -73.9571), "Bedford-Stuyvesant": (40.6872, -73.9418), "Bushwick": (40.6958, -73.9171),
+        "Crown Heights": (40.6694, -73.9422), "Greenpoint": (40.7304, -73.9515), "Park Slope": (40.6710, -73.9814),
+        "Flatbush": (40.6415, -73.9594), "Clinton Hill": (40.6897, -73.9661), "Prospect Heights": (40.6775, -73.9692),
+        "Fort Greene": (40.6920, -73.9742),
+    }),
+    "Queens": (0.116, 0.8, {
+        "Astoria": (40.7644, -73.9235), "Long Island City": (40.7447, -73.9485), "Flushing": (40.7675, -73.8331),
+        "Ridgewood": (40.7043, -73.9018), "Sunnyside": (40.7433, -73.9196), "Jamaica": (40.7027, -73.7890),
+    }),
+    "Bronx": (0.022, 0.7, {
+        "Kingsbridge": (40.8834, -73.9051), "Fordham": (40.8615, -73.8904), "Mott Haven": (40.8091, -73.9229),
+        "Concourse": (40.8340, -73.9180),
+    }),
+    "Staten Island": (0.008, 0.75, {
+        "St. George": (40.6437, -74.0736), "Tompkinsville": (40.6366, -74.0779), "Arrochar": (40.5960, -74.0727),
+    }),
+}
+
+# (oda tipi payı, fiyat çarpanı)
+ROOM_TYPES = {"Entire home/apt": (0.520, 1.0), "Private room": (0.457, 0.45), "Shared room": (0.023, 0.33)}
+
+LAST_REVIEW_START = np.datetime64("2011-03-28")
+LAST_REVIEW_END = np.datetime64("2019-07-08")
+
+
+def _neighbourhood_table():
+    rows = []
+    for group, (share, price_factor, neighbourhoods) in BOROUGHS.items():
+        # İlçe içinde mahalle ağırlıkları listedeki sıraya göre azalır
+        weights = 1 / np.arange(1, len(neighbourhoods) + 1) ** 0.7
+        weights = weights / weights.sum() * share
+        for (name, (lat, lon)), weight in zip(neighbourhoods.items(), weights):
+            rows.append((group, name, lat, lon, weight, price_factor))
+    table = pd.DataFrame(rows, columns=["group", "neighbourhood", "lat", "lon", "weight", "price_factor"])
+    table["weight"] /= table["weight"].sum()
+    return table
+
+
+def generate_chunk(n_rows, rng, start_id=0):
+    """n_rows synthetic listings drawn from rng, with ids starting at start_id."""
+    table = _neighbourhood_table()
+    hood = table.iloc[rng.choice(len(table), size=n_rows, p=table["weight"].to_numpy())]
+    room_names = list(ROOM_TYPES)
+    room_idx = rng.choice(len(room_names), size=n_rows, p=[share for share, _ in ROOM_TYPES.values()])
+    room_factor = np.array([factor for _, factor in ROOM_TYPES.values()])[room_idx]
+
+    price = np.round(np.exp(rng.normal(np.log(160), 0.6, n_rows)) * hood["price_factor"].to_numpy() * room_factor)
+    # Uzun kuyruk ve birkaç sıfır fiyat
+    tail = rng.random(n_rows) < 0.005
+    price[tail] = np.round(rng.pareto(1.2, tail.sum()) * 1000 + 1000)
+    price[rng.random(n_rows) < 0.0002] = 0
+    price = np.clip(price, 0, 10000).astype(np.int64)
+
+    minimum_nights = np.where(rng.random(n_rows) < 0.08, 30,
+                              np.minimum(rng.geometric(0.35, n_rows), 1250)).astype(np.int64)
+    outliers = rng.random(n_rows) < 0.002
+    minimum_nights[outliers] = rng.integers(31, 1251, outliers.sum())
+
+    number_of_reviews = np.where(rng.random(n_rows) < 0.12, 0,
+                                 np.minimum(rng.negative_binomial(0.6, 0.02, n_rows), 629)).astype(np.int64)
+    has_reviews = number_of_reviews > 0
+    reviews_per_month = np.where(has_reviews, np.round(np.clip(rng.lognormal(-0.3, 1.0, n_rows), 0.01, 58.5), 2), np.nan)
+    span_days = int((LAST_REVIEW_END - LAST_REVIEW_START) / np.timedelta64(1, "D"))
+    # Son yorumlar 2019'a yığılır
+    offsets = span_days - np.minimum(rng.exponential(120, n_rows), span_days).astype(np.int64)
+    last_review = np.where(has_reviews, (LAST_REVIEW_START + offsets.astype("timedelta64[D]")).astype(str), "")
+
+    host_listings = np.minimum(rng.zipf(2.2, n_rows), 327).astype(np.int64)
+    availability = np.where(rng.random(n_rows) < 0.36, 0, rng.integers(1, 366, n_rows)).astype(np.int64)
+
+    ids = np.arange(start_id, start_id + n_rows, dtype=np.int64) + 2539
+    chunk = pd.DataFrame({
+        "id": ids,
+        "name": [f"Listing {i}" for i in ids],
+        "host_id": rng.integers(2438, 274_321_313, n_rows),
+        "host_name": "Host",
+        "neighbourhood_group": hood["group"].to_numpy(),
+        "neighbourhood": hood["neighbourhood"].to_numpy(),
+        "latitude": np.round(hood["lat"].to_numpy() + rng.normal(0, 0.008, n_rows), 5),
+        "longitude": np.round(hood["lon"].to_numpy() + rng.normal(0, 0.010, n_rows), 5),
+        "room_type": np.array(room_names, dtype=object)[room_idx],
+        "price": price,
+        "minimum_nights": minimum_nights,
+        "number_of_reviews": number_of_reviews,
+        "last_review": last_review,
+        "reviews_per_month": reviews_per_month,
+        "calculated_host_listings_count": host_listings,
+        "availability_365": availability,
+    }, columns=COLUMNS)
+    chunk["last_review"] = chunk["last_review"].replace("", np.nan)
+    return chunk
+
+
+def generate(n_rows, seed=42, chunk_size=100_000):
+    """Yield chunks that together make n_rows listings; deterministic for a seed."""
+    for chunk_index, start in enumerate(range(0, n_rows, chunk_size)):
+        # Parça başına ayrı tohum: parça boyutu aynı kaldıkça sonuç da aynı kalır
+        rng = np.random.default_rng([seed, chunk_index])
+        yield generate_chunk(min(chunk_size, n_rows - start), rng, start_id=start)
+
+
+def write_csv(path, n_rows, seed=42, chunk_size=100_000):
+    """Write n_rows synthetic listings to path and return path."""
+    for i, chunk in enumerate(generate(n_rows, seed, chunk_size)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AB_NYC_2019 şemasında sentetik ilan verisi üretir.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--out", default="synthetic.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    write_csv(args.out, args.rows, args.seed, args.chunk_size)
+    print(f"{args.rows} satır yazıldı: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Columnar cache for listing CSVs.
+
+A source CSV is parsed once, its dtypes are tightened (low-cardinality strings
+become categoricals, integers are downcast, floats only when lossless) and the
+result is written as an uncompressed Feather file named after the content hash.
+Later loads memory-map that file and can read just the columns they need:
+
+    python data_cache.py AB_NYC_2019.csv
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+CACHE_DIR = ".cache"
+# Bu oranın altında tekrar eden metin sütunları kategorik tutulur.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def content_digest(source, block_size=1 << 20):
+    """sha256 of a file path or raw bytes."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def optimize_dtypes(df):
+    """Return df with categorical strings and the smallest lossless numeric dtypes."""
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if series.nunique(dropna=True) <= CATEGORY_MAX_UNIQUE_RATIO * max(len(series), 1):
+                series = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            series = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            downcast = series.astype(np.float32)
+            # Koordinatlar gibi hassas sütunlarda float32 değer kaybettirir; o zaman float64 kalır.
+            if np.array_equal(downcast.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+                series = downcast
+        out[col] = series
+    return pd.DataFrame(out, index=df.index)
+
+
+def dataset_fingerprint(df):
+    """Content hash of a listings DataFrame (column names, dtypes and values)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{digest}.feather")
+
+
+def build_cache(source, cache_dir=CACHE_DIR, digest=None):
+    """Convert a CSV (path or bytes) into its Feather cache file and return the path."""
+    digest = digest or content_digest(source)
+    path = cache_path(digest, cache_dir)
+    if os.path.exists(path):
+        instrumentation.mark_cache(True)
+        return path
+    instrumentation.mark_cache(False)
+    csv = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+    with instrumentation.span("read_csv"):
+        df = optimize_dtypes(pd.read_csv(csv))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+@instrumentation.timed()
+def load_dataset(source, columns=None, cache_dir=CACHE_DIR):
+    """Load a listings CSV through the columnar cache, optionally only some columns."""
+    import pyarrow.feather as feather
+    path = build_cache(source, cache_dir)
+    return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV dosyasını sütunlu önbelleğe dönüştürür.")
+    parser.add_argument("source", nargs="?", default="AB_NYC_2019.csv")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    raw = pd.read_csv(args.source)
+    csv_seconds = time.perf_counter() - start
+
+    path = build_cache(args.source, args.cache_dir)
+    start = time.perf_counter()
+    cached = load_dataset(args.source, cache_dir=args.cache_dir)
+    cache_seconds = time.perf_counter() - start
+
+    raw_mb = raw.memory_usage(deep=True).sum() / 1e6
+    cached_mb = cached.memory_usage(deep=True).sum() / 1e6
+    print(f"Önbellek: {path}")
+    print(f"read_csv : {csv_seconds:.3f} s, {raw_mb:.1f} MB bellek")
+    print(f"önbellek : {cache_seconds:.3f} s, {cached_mb:.1f} MB bellek")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Cached evaluation for the "Model Sonuçları" page.
+
+Metrics, test-set predictions, the correlation matrix and the rendered figures
+are stored on disk under a key built from the dataset fingerprint, the split
+seed/size and the model hyperparameters. The cache directory is kept under a
+size budget by evicting the least recently used entries.
+"""
+import hashlib
+import json
+import os
+import pickle
+import timeit
+
+import numpy as np
+
+import instrumentation
+from training import MODEL_SPECS, scaled_progress, train_models
+
+EVAL_CACHE_DIR = os.path.join(".cache", "evaluations")
+EVAL_CACHE_MAX_BYTES = int(os.environ.get("EVAL_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+# Gerçek-tahmin grafiklerindeki referans çizgisinin rengi
+LINE_COLORS = {"Karar Ağacı": "brown"}
+
+
+class EvaluationCache:
+    """Pickle files on disk with least-recently-used eviction by total size."""
+
+    def __init__(self, directory=EVAL_CACHE_DIR, max_bytes=EVAL_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        # Erişim zamanı LRU sıralaması için mtime'a yazılır
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        # Başka bir iş aynı anda temizlik yapıyor olabilir; kaybolan dosyalar atlanır
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+def evaluation_key(fingerprint, seed, test_size, specs):
+    spec_desc = {name: [f"{cls.__module__}.{cls.__name__}", params] for name, (cls, params) in specs.items()}
+    payload = json.dumps([fingerprint, seed, test_size, spec_desc], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def actual_vs_predicted_png(y_test, predictions, line_color="red"):
+    import matplotlib.pyplot as plt
+    from plotting import figure_png, scatter
+    fig, ax = plt.subplots(figsize=(8, 6))
+    scatter(ax, y_test, predictions, alpha=0.5)
+    ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], color=line_color, linestyle="--")
+    ax.set_xlabel("Gerçek Değerler (Fiyat)")
+    ax.set_ylabel("Tahmin Edilen Değerler (Fiyat)")
+    ax.set_title("Gerçek vs. Tahmin Edilen Fiyatlar")
+    return figure_png(fig)
+
+
+def decision_tree_png(model, feature_names):
+    import matplotlib.pyplot as plt
+    from sklearn.tree import plot_tree
+
+    from plotting import figure_png
+    fig, ax = plt.subplots(figsize=(20, 10))
+    plot_tree(model, feature_names=list(feature_names), filled=True, rounded=True, ax=ax)
+    ax.set_title("Decision Tree")
+    return figure_png(fig)
+
+
+def correlation_png(corr):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    from plotting import figure_png
+    fig, ax = plt.subplots(figsize=(12, 10))
+    sns.heatmap(corr, annot=True, fmt=".2f", cmap="coolwarm", square=True, ax=ax)
+    ax.set_title("Değişkenler Arası Korelasyon Matrisi")
+    return figure_png(fig)
+
+
+def regression_metrics(y_true, y_pred):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    mse = mean_squared_error(y_true, y_pred)
+    return {"MAE": mean_absolute_error(y_true, y_pred), "MSE": mse, "RMSE": float(np.sqrt(mse)),
+            "R²": r2_score(y_true, y_pred)}
+
+
+def model_profile(model, X, repeat=5):
+    """Single-row prediction latency (best of repeat, ms) and pickled size (MB) of a fitted model."""
+    row = np.asarray(X[:1], dtype=np.float32)
+    seconds = min(timeit.repeat(lambda: model.predict(row), number=1, repeat=repeat))
+    return {"predict_ms": seconds * 1000,
+            "size_mb": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 2 ** 20}
+
+
+@instrumentation.timed()
+def evaluate_models(df, fingerprint, seed=42, test_size=0.2, specs=None, cache=None, n_workers=None,
+                    progress=None):
+    """Train/test evaluation of every model in specs, served from the cache when possible.
+
+    Returns a dict with "metrics", "y_test", "predictions", "fit_seconds",
+    "profiles" (see model_profile), "corr" and "figures" (PNG bytes) plus
+    "cache_hit". progress(fraction,
+    message), when given, follows preprocessing, each model fit and plotting.
+    """
+    from sklearn.model_selection import train_test_split
+
+    from preprocessing import preprocess_data
+
+    specs = MODEL_SPECS if specs is None else specs
+    cache = EvaluationCache() if cache is None else cache
+    key = evaluation_key(fingerprint, seed, test_size, specs)
+    result = cache.get(key)
+    instrumentation.mark_cache(result is not None)
+    if result is not None:
+        result["cache_hit"] = True
+        return result
+
+    if progress is not None:
+        progress(0.0, "Veri ön işleniyor")
+    X, y, processed_df = preprocess_data(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=seed)
+    trained = train_models(X_train, y_train, X_test, specs=specs, n_workers=n_workers,
+                           progress=scaled_progress(progress, 0.1, 0.85))
+    if progress is not None:
+        progress(0.85, "Grafikler çiziliyor")
+
+    y_test = y_test.to_numpy()
+    corr = processed_df.select_dtypes(include="number").corr()
+    figures = {"corr": correlation_png(corr)}
+    for name, t in trained.items():
+        figures[name] = actual_vs_predicted_png(y_test, t["predictions"], LINE_COLORS.get(name, "red"))
+        if hasattr(t["model"], "tree_") and t["model"].get_depth() <= 6:
+            figures[f"{name} ağaç"] = decision_tree_png(t["model"], X.columns)
+
+    result = {
+        "metrics": {name: regression_metrics(y_test, t["predictions"]) for name, t in trained.items()},
+        "y_test": y_test,
+        "predictions": {name: t["predictions"] for name, t in trained.items()},
+        "fit_seconds": {name: t["fit_seconds"] for name, t in trained.items()},
+        "profiles": {name: model_profile(t["model"], X_test) for name, t in trained.items()},
+        "corr": corr,
+        "figures": figures,
+    }
+    cache.put(key, result)
+    result["cache_hit"] = False
+    return result
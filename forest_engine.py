@@ -0,0 +1,214 @@
+"""Compact, array-backed inference for fitted tree ensembles.
+
+CompactForest packs every tree of a fitted RandomForestRegressor (or a single
+DecisionTreeRegressor) into flat NumPy arrays: split feature, threshold,
+left/right child and leaf value per node. Leaves point to themselves, so
+prediction is a fixed number of vectorized gather steps over all
+(tree, row) pairs, with no per-call sklearn/joblib overhead:
+
+    python forest_engine.py --artifact-dir artifacts --data AB_NYC_2019.csv
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+
+def _round_down_float32(threshold):
+    """float32 thresholds that send every float32 input the same way as the float64 ones.
+
+    sklearn compares float32 features with float64 thresholds; rounding each
+    threshold down to the nearest float32 keeps x <= t decisions identical.
+    """
+    t32 = threshold.astype(np.float32)
+    above = t32.astype(np.float64) > threshold
+    t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+    return t32
+
+
+class CompactForest:
+    """Flat-array tree ensemble with vectorized traversal."""
+
+    def __init__(self, feature, threshold, left, right, missing_left, values, roots, max_depth,
+                 n_features, value_offset=0.0, value_scale=1.0):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.values = values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.value_offset = value_offset
+        self.value_scale = value_scale
+
+    @classmethod
+    def from_sklearn(cls, model, float32_thresholds=True, quantize_leaves=False):
+        """Pack a fitted sklearn regression tree or forest.
+
+        quantize_leaves stores leaf values as uint16 codes over the value range;
+        the error per leaf is at most (max - min) / 131070.
+        """
+        trees = [e.tree_ for e in getattr(model, "estimators_", [model])]
+        sizes = np.array([t.node_count for t in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        node_dtype = np.int32 if sizes.sum() < 2 ** 31 else np.int64
+
+        feature, threshold, left, right, missing_left, values = [], [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            is_leaf = tree.children_left < 0
+            own = np.arange(tree.node_count) + offset
+            # Yapraklar kendilerini gösterir; böylece her ağaç aynı sayıda adımda dolaşılabilir
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            go_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8))
+            missing_left.append(np.asarray(go_left, dtype=bool))
+            values.append(tree.value[:, 0, 0])
+
+        threshold = np.concatenate(threshold)
+        values = np.concatenate(values)
+        n_features = int(model.n_features_in_)
+        value_offset, value_scale = 0.0, 1.0
+        if quantize_leaves:
+            value_offset = float(values.min())
+            value_scale = float(values.max() - value_offset) / 65535 or 1.0
+            values = np.round((values - value_offset) / value_scale).astype(np.uint16)
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.min_scalar_type(n_features)),
+            threshold=_round_down_float32(threshold) if float32_thresholds else threshold,
+            left=np.concatenate(left).astype(node_dtype),
+            right=np.concatenate(right).astype(node_dtype),
+            missing_left=np.concatenate(missing_left),
+            values=values,
+            roots=offsets.astype(node_dtype),
+            max_depth=max(int(t.max_depth) for t in trees),
+            n_features=n_features,
+            value_offset=value_offset,
+            value_scale=value_scale,
+        )
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right,
+                                      self.missing_left, self.values, self.roots))
+
+    def leaf_values(self, leaves):
+        values = self.values[leaves]
+        if values.dtype == np.uint16:
+            return values * self.value_scale + self.value_offset
+        return values.astype(np.float64)
+
+    def apply(self, X, compact_every=4):
+        """Leaf index of every row in every tree, shape (n_trees, n_rows).
+
+        Every compact_every steps, (tree, row) pairs that already sit on a leaf
+        are dropped from the working set, so shallow branches stop costing work.
+        """
+        # sklearn ağaçları float32 girdiyle karşılaştırma yapar; aynı sonucu almak için aynı dönüşüm
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = X.shape[0]
+        flat_X = X.ravel()
+        has_nan = bool(np.isnan(flat_X).any())
+
+        leaves = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows, dtype=np.int64) * self.n_features, len(self.roots))
+        active = np.arange(leaves.size)
+        nodes = leaves.copy()
+        for step in range(self.max_depth):
+            x = flat_X[row_offsets + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[nodes]
+            next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            if step % compact_every == compact_every - 1:
+                moving = next_nodes != nodes
+                leaves[active] = next_nodes
+                active, nodes, row_offsets = active[moving], next_nodes[moving], row_offsets[moving]
+                if not active.size:
+                    break
+            else:
+                nodes = next_nodes
+        leaves[active] = nodes
+        return leaves.reshape(len(self.roots), n_rows)
+
+    def predict(self, X, chunk_size=4096):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            out[start:start + chunk_size] = self.leaf_values(leaves).mean(axis=0)
+        return out
+
+
+def _best_time(fn, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(model, X, engines=None, repeat=5):
+    """Size, single-row latency, batch throughput and max prediction error vs sklearn."""
+    if engines is None:
+        engines = {
+            "compact": CompactForest.from_sklearn(model),
+            "compact+quantized": CompactForest.from_sklearn(model, quantize_leaves=True),
+        }
+    reference = model.predict(X)
+    row = X[:1]
+    report = {"sklearn": {
+        "bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "single_row_ms": _best_time(lambda: model.predict(row), repeat) * 1000,
+        "rows_per_s": len(X) / _best_time(lambda: model.predict(X), max(1, repeat // 2)),
+        "max_abs_error": 0.0,
+    }}
+    for name, engine in engines.items():
+        report[name] = {
+            "bytes": engine.nbytes,
+            "single_row_ms": _best_time(lambda: engine.predict(row), repeat) * 1000,
+            "rows_per_s": len(X) / _best_time(lambda: engine.predict(X), max(1, repeat // 2)),
+            "max_abs_error": float(np.abs(engine.predict(X) - reference).max()),
+        }
+    return report
+
+
+def main():
+    from data_cache import load_dataset
+    from model_store import ARTIFACT_DIR, load_artifact
+
+    parser = argparse.ArgumentParser(description="Random Forest modelini kompakt motorla karşılaştırır.")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--data", default="AB_NYC_2019.csv")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    artifact = load_artifact(args.artifact_dir)
+    df = load_dataset(args.data)
+    X = artifact["pipeline"].transform(df.head(args.rows))
+    model = artifact["model"]
+    model.set_params(n_jobs=None)
+
+    report = compare(model, X)
+    base = report["sklearn"]["bytes"]
+    print(f"{'':>18} {'MB':>8} {'küçülme':>8} {'tek satır ms':>13} {'satır/s':>12} {'maks. hata':>11}")
+    for name, r in report.items():
+        print(f"{name:>18} {r['bytes'] / 1e6:>8.1f} {base / r['bytes']:>7.1f}x {r['single_row_ms']:>13.3f} "
+              f"{r['rows_per_s']:>12,.0f} {r['max_abs_error']:>11.2e}")
+    if report["compact"]["max_abs_error"] > args.tolerance:
+        raise SystemExit(f"Kompakt motor tahminleri tolerans dışında: {report['compact']['max_abs_error']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Incremental refresh of the stored price model.
+
+New listings update the pipeline's running statistics (per-neighbourhood
+price sums/counts behind neighbourhood_encoded, Yeo-Johnson statistics of
+reviews_per_month) and train a few warm-started trees on the new rows only.
+The oldest trees are then retired so the forest size stays fixed. The
+listing index is rebuilt over the old and new listings, so new listings show
+up as comparables and their neighbourhoods can be resolved from coordinates.
+Apart from that index rebuild, cost depends on the size of the delta, not on
+the whole history:
+
+    python incremental.py new_listings.csv --new-trees 10
+    python incremental.py new_listings.csv --data AB_NYC_2019.csv   # uygulamanın kullandığı birleşik veri
+
+Old trees keep the splits they learned on the features of their time, and
+those features shift slightly as the statistics update; a periodic full
+retrain (model_store.py --force) brings everything back in line.
+"""
+import argparse
+import hashlib
+import time
+import uuid
+
+from forest_engine import CompactForest
+from model_store import ARTIFACT_DIR, dataset_fingerprint, load_artifact, save_artifact
+from preprocessing import preprocess_data
+
+
+def refresh_artifact(artifact, new_df, n_new_trees=10, max_trees=None):
+    """Update a loaded artifact in place with new_df and return it.
+
+    max_trees defaults to the configured n_estimators, so every added tree
+    retires the oldest one.
+    """
+    if artifact["params"].get("backend") == "boosting":
+        raise ValueError("Artımlı güncelleme yalnızca Random Forest modeli için; boosting modelini "
+                         "model_store.py --force ile yeniden eğitin")
+    pipeline = artifact["pipeline"]
+    pipeline.partial_fit(new_df)
+
+    X_new, y_new, _ = preprocess_data(new_df, pipeline)
+    model = artifact["model"]
+    n_trees = len(model.estimators_)
+    # warm_start: mevcut ağaçlar korunur, yalnızca yeni ağaçlar yeni satırlarla eğitilir
+    model.set_params(warm_start=True, n_estimators=n_trees + n_new_trees)
+    model.fit(X_new, y_new)
+
+    max_trees = artifact["params"].get("n_estimators", n_trees) if max_trees is None else max_trees
+    if len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+
+    artifact["engine"] = CompactForest.from_sklearn(model)
+    if "index" in artifact:
+        artifact["index"] = artifact["index"].extend(new_df)
+    chained = hashlib.sha256((artifact["fingerprint"] + dataset_fingerprint(new_df)).encode("utf-8"))
+    artifact["fingerprint"] = chained.hexdigest()
+    artifact["model_id"] = uuid.uuid4().hex
+    return artifact
+
+
+def main():
+    from data_cache import load_dataset
+
+    parser = argparse.ArgumentParser(description="Kayıtlı modeli yeni ilanlarla artımlı olarak günceller.")
+    parser.add_argument("new", help="Yeni ilanları içeren CSV")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--new-trees", type=int, default=10)
+    parser.add_argument("--max-trees", type=int, default=None)
+    parser.add_argument("--data", help="Güncelleme sonrası tam veri seti; parmak izi uygulamayla eşleşsin diye kaydedilir")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # Güncellenen dizilerin diske geri yazılması gerektiği için memory-map kullanılmaz
+    artifact = load_artifact(args.artifact_dir, mmap_mode=None)
+    new_df = load_dataset(args.new)
+    refresh_artifact(artifact, new_df, args.new_trees, args.max_trees)
+    if args.data:
+        artifact["fingerprint"] = dataset_fingerprint(load_dataset(args.data))
+    save_artifact(artifact, args.artifact_dir)
+    print(f"{len(new_df)} yeni ilanla güncellendi ({len(artifact['model'].estimators_)} ağaç, "
+          f"konum dizininde {len(artifact['index'].listings)} ilan), "
+          f"{time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
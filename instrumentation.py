@@ -0,0 +1,227 @@
+"""Lightweight timing instrumentation for app pages and pipeline stages.
+
+Spans record wall time, CPU time of the running thread, the process's peak
+RSS and, for cached calls, whether the cache was hit. Finished spans go to a
+process-wide ring buffer and into cumulative totals, exported as JSON or as
+Prometheus text. Nested spans remember their parent and the page render
+they belong to.
+
+Collection is off unless PERF_INSTRUMENTATION=1 is set. set_enabled
+overrides that for the calling thread only, so one Streamlit session
+switching its panel on or off does not affect the others' script runs. While
+off, span() returns a shared no-op context manager and timed() wrappers cost
+a single flag check.
+"""
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+BUFFER_SIZE = int(os.environ.get("PERF_BUFFER_SIZE", 2000))
+
+_enabled = os.environ.get("PERF_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+_local = threading.local()
+
+
+def is_enabled():
+    return getattr(_local, "enabled", _enabled)
+
+
+def set_enabled(enabled):
+    """Turn collection on or off for the calling thread (one session's script run)."""
+    _local.enabled = bool(enabled)
+
+
+def _max_rss_mb():
+    # Linux'ta ru_maxrss KB, macOS'ta bayt cinsindendir
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Recorder:
+    """Ring buffer of finished spans plus cumulative per-stage totals."""
+
+    def __init__(self, size=BUFFER_SIZE):
+        self.records = deque(maxlen=size)
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            totals = self.totals.setdefault((record["name"], record["kind"]),
+                                            {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "hits": 0, "misses": 0})
+            totals["calls"] += 1
+            totals["wall_s"] += record["wall_s"]
+            totals["cpu_s"] += record["cpu_s"]
+            if record["cache"] == "hit":
+                totals["hits"] += 1
+            elif record["cache"] == "miss":
+                totals["misses"] += 1
+
+    def snapshot(self, run=None):
+        """Buffered spans, oldest first; only one page render's spans when run is given."""
+        with self._lock:
+            records = list(self.records)
+        return [r for r in records if run is None or r["run"] == run]
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+            self.totals.clear()
+
+    def summary(self):
+        """Cumulative totals as one dict per (name, kind)."""
+        with self._lock:
+            return [{"name": name, "kind": kind, **values} for (name, kind), values in self.totals.items()]
+
+    def to_json(self, indent=2):
+        return json.dumps({"max_rss_mb": round(_max_rss_mb(), 1), "totals": self.summary(), "spans": self.snapshot()},
+                          indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self, prefix="airbnb"):
+        """Cumulative totals in the Prometheus text exposition format."""
+        def labels(name, kind, **extra):
+            pairs = {"stage": name, "kind": kind, **extra}
+            return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs.items()) + "}"
+
+        with self._lock:
+            totals = sorted(self.totals.items())
+        lines = []
+        for metric, key, help_text in (("stage_calls_total", "calls", "Number of finished spans."),
+                                       ("stage_seconds_total", "wall_s", "Wall time spent in spans."),
+                                       ("stage_cpu_seconds_total", "cpu_s", "Thread CPU time spent in spans.")):
+            lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} counter"]
+            lines += [f"{prefix}_{metric}{labels(name, kind)} {values[key]:g}" for (name, kind), values in totals]
+        lines += [f"# HELP {prefix}_cache_requests_total Cached calls by result.",
+                  f"# TYPE {prefix}_cache_requests_total counter"]
+        for (name, kind), values in totals:
+            if values["hits"] or values["misses"]:
+                lines.append(f"{prefix}_cache_requests_total{labels(name, kind, result='hit')} {values['hits']}")
+                lines.append(f"{prefix}_cache_requests_total{labels(name, kind, result='miss')} {values['misses']}")
+        lines += [f"# HELP {prefix}_process_max_rss_bytes Peak resident set size of the process.",
+                  f"# TYPE {prefix}_process_max_rss_bytes gauge",
+                  f"{prefix}_process_max_rss_bytes {int(_max_rss_mb() * 2 ** 20)}"]
+        return "\n".join(lines) + "\n"
+
+
+recorder = Recorder()
+
+
+class Span:
+    """One timed region; use as a context manager or with begin()/end()."""
+
+    def __init__(self, name, kind="stage", **labels):
+        self.name = name
+        self.kind = kind
+        self.labels = labels
+        self.cache = None
+
+    def __enter__(self):
+        stack = _stack()
+        parent = stack[-1] if stack else None
+        self.parent = parent.name if parent else None
+        self.run = parent.run if parent else uuid.uuid4().hex[:12]
+        stack.append(self)
+        self._rss = _max_rss_mb()
+        self._cpu = time.thread_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = time.thread_time() - self._cpu
+        max_rss = _max_rss_mb()
+        stack = _stack()
+        if self in stack:
+            del stack[stack.index(self):]
+        recorder.add({
+            "name": self.name, "kind": self.kind, "parent": self.parent, "run": self.run,
+            "time": time.time(), "wall_s": round(wall, 6), "cpu_s": round(cpu, 6),
+            "max_rss_mb": round(max_rss, 1), "rss_growth_mb": round(max_rss - self._rss, 1),
+            "cache": self.cache, "error": exc_type.__name__ if exc_type else None, **self.labels,
+        })
+        return False
+
+    def end(self):
+        self.__exit__(None, None, None)
+
+
+class _NoSpan:
+    cache = None
+    run = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def end(self):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, kind="stage", **labels):
+    """Context manager timing the enclosed block (a no-op while disabled)."""
+    return Span(name, kind, **labels) if is_enabled() else _NO_SPAN
+
+
+def begin(name, kind="page", **labels):
+    """Open a top-level span that is closed later with .end().
+
+    Spans left open by an interrupted script run (st.stop, rerun) are
+    discarded, so every page render starts from an empty stack.
+    """
+    if not is_enabled():
+        return _NO_SPAN
+    _stack().clear()
+    return Span(name, kind, **labels).__enter__()
+
+
+def mark_cache(hit):
+    """Record a cache hit or miss on the innermost open span."""
+    stack = getattr(_local, "stack", None)
+    if stack and is_enabled():
+        stack[-1].cache = "hit" if hit else "miss"
+
+
+def timed(name=None, kind="stage", cached=False):
+    """Decorator wrapping every call in a span.
+
+    With cached=True the call is counted as a cache hit unless the wrapped
+    body reported a miss with mark_cache(False); this suits st.cache_data
+    functions, whose body only runs on a miss.
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            with Span(span_name, kind) as current:
+                result = fn(*args, **kwargs)
+                if cached and current.cache is None:
+                    current.cache = "hit"
+                return result
+        return wrapper
+    return decorator
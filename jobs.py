@@ -0,0 +1,129 @@
+"""Background job scheduler for model training.
+
+Pages submit training work under a key built from the job kind, the dataset
+fingerprint and the hyperparameters. The scheduler runs each distinct key
+once in a small thread pool; sessions that submit the same key get the same
+Job back, follow its progress while it runs and all read the same result when
+it finishes. sklearn releases the GIL while building trees, so fits run in
+parallel with the Streamlit script threads.
+
+Finished jobs are kept (most recently used first, JOB_KEEP_FINISHED of them)
+as the shared in-memory store. The price model job only returns the
+artifact's metadata: ensure_artifact writes the model to the artifact store
+on disk and pages load it through the city registry's cache (registry.py).
+Failed jobs keep their error until they are resubmitted with retry=True.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_KEEP_FINISHED = int(os.environ.get("JOB_KEEP_FINISHED", 8))
+
+
+def job_key(kind, fingerprint, params=None):
+    """Stable key of a job: same kind, data and hyperparameters -> same key."""
+    payload = json.dumps([kind, fingerprint, params], sort_keys=True, default=str)
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+class Job:
+    """State of one submitted job; progress and result are read from any thread."""
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = "Sırada bekliyor"
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def report(self, fraction, message=None):
+        """Progress callback handed to the job function."""
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or timeout passes; True if it finished."""
+        return self._done.wait(timeout)
+
+    def _run(self, fn, args, kwargs):
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            self.result = fn(*args, progress=self.report, **kwargs)
+            self.status = "done"
+            self.report(1.0, "Tamamlandı")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+            self._done.set()
+
+
+class JobScheduler:
+    """Deduplicating scheduler on top of a thread pool."""
+
+    def __init__(self, workers=JOB_WORKERS, keep_finished=JOB_KEEP_FINISHED):
+        self.keep_finished = keep_finished
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="train-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, label=None, retry=False, **kwargs):
+        """Return the job for key, starting fn(*args, progress=..., **kwargs) if none exists.
+
+        fn must accept a progress(fraction, message) keyword argument.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (retry and job.status == "failed"):
+                self._jobs.move_to_end(key)
+                return job
+            job = Job(key, label or key)
+            self._jobs[key] = job
+            self._evict()
+        self._pool.submit(job._run, fn, args, kwargs)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _evict(self):
+        # Yalnızca bitmiş işler atılır; çalışan işler her zaman izlenebilir kalır
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[key]
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler shared by every session."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler()
+        return _scheduler
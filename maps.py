@@ -0,0 +1,73 @@
+"""Folium map construction for the "Harita Görselleştirme" page.
+
+Maps are rendered straight to an HTML string (no temporary files). The cluster
+layer sends every listing as compact numeric rows built from NumPy arrays and
+lets Leaflet.markercluster build markers and clusters in the browser.
+"""
+import json
+
+import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster, HeatMap
+
+import instrumentation
+
+# Popup metni tarayıcıda oluşturulur; her satırda yalnızca sayılar gönderilir
+_CLUSTER_CALLBACK = """function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup('Room type: ' + %s[row[2]] + ', Availability (365 days): ' + row[3] + ', Price: $' + row[4]);
+    return marker;
+}"""
+
+
+@instrumentation.timed("folium_html")
+def map_html(m):
+    """Full HTML document of a folium map, rendered in memory."""
+    return m.get_root().render()
+
+
+def base_map(center, zoom_start=11):
+    """Empty map around center ([lat, lon], the city's center in the registry)."""
+    return folium.Map(location=center, tiles='cartodbpositron', zoom_start=zoom_start)
+
+
+def _valid_coordinates(df):
+    lat = df["latitude"].to_numpy(dtype=float)
+    lon = df["longitude"].to_numpy(dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    return lat, lon, valid
+
+
+def cluster_map(df, center, room_types=None, zoom_start=11):
+    """Marker cluster of every listing, optionally limited to some room types."""
+    if room_types is not None:
+        df = df[df["room_type"].isin(room_types)]
+    lat, lon, valid = _valid_coordinates(df)
+    levels, codes = np.unique(df["room_type"].astype(str).to_numpy(), return_inverse=True)
+    availability = df["availability_365"].to_numpy()
+    price = df["price"].to_numpy()
+
+    # Satırlar [lat, lon, oda tipi kodu, müsaitlik, fiyat]; geçersiz koordinatlar toplu olarak ayıklanır
+    data = list(zip(
+        np.round(lat[valid], 5).tolist(),
+        np.round(lon[valid], 5).tolist(),
+        codes[valid].tolist(),
+        availability[valid].tolist(),
+        price[valid].tolist(),
+    ))
+    m = base_map(center, zoom_start)
+    FastMarkerCluster(data, callback=_CLUSTER_CALLBACK % json.dumps(levels.tolist()), chunkedLoading=True).add_to(m)
+    return m
+
+
+DENSITY_METRICS = {"count": "İlan sayısı", "mean_price": "Ortalama fiyat", "median_price": "Medyan fiyat"}
+
+
+def density_map(cells, center, metric="count", zoom_start=11):
+    """Heatmap drawn from pre-aggregated grid cells (see spatial.build_pyramid)."""
+    m = base_map(center, zoom_start)
+    weights = cells[metric].to_numpy(dtype=float)
+    weights = weights / weights.max() if len(weights) and weights.max() > 0 else weights
+    data = np.column_stack([cells["latitude"].to_numpy(), cells["longitude"].to_numpy(), weights])
+    HeatMap(data=np.round(data, 5).tolist(), radius=15, max_zoom=13).add_to(m)
+    return m
@@ -0,0 +1,259 @@
+"""Persisted price model artifacts.
+
+The "Fiyat Tahmin" page used to refit a RandomForest on every rerun. The model is
+now trained once per (dataset, hyperparameters) pair, saved with joblib and
+loaded memory-mapped afterwards:
+
+    python model_store.py --data AB_NYC_2019.csv
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+import instrumentation
+from boosting import DEFAULT_PARAMS, BoostingRegressor
+from data_cache import dataset_fingerprint, load_dataset
+from forest_engine import CompactForest
+from preprocessing import FeaturePipeline, preprocess_data
+from spatial import ListingIndex
+from training import fit_forest, scaled_progress
+
+ARTIFACT_DIR = "artifacts"
+RF_PARAMS = {"n_estimators": 100, "random_state": 42}
+BOOSTING_PARAMS = {"backend": "boosting", **DEFAULT_PARAMS}
+# Fiyat modeli: "forest" (Random Forest) ya da "boosting" (histogram gradient boosting, bkz. boosting.py)
+PRICE_MODEL_BACKEND = os.environ.get("PRICE_MODEL_BACKEND", "forest")
+# Artifact içeriği değiştiğinde artırılır; eski kayıtlar yeniden eğitilir.
+ARTIFACT_VERSION = 7
+# Bu boyuta kadar olan tahminler kompakt motorla, daha büyükleri sklearn ile yapılır
+ENGINE_MAX_ROWS = 1024
+
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+TUNING_FILE = "tuning.json"
+
+
+def _artifact_path(artifact_dir, name):
+    return os.path.join(artifact_dir, name)
+
+
+def read_meta(artifact_dir=ARTIFACT_DIR):
+    """Metadata of the stored artifact, or None if there is none."""
+    try:
+        with open(_artifact_path(artifact_dir, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_tuning(report, artifact_dir=ARTIFACT_DIR):
+    """Store a tuning.py report; its params are served for the same dataset from now on."""
+    os.makedirs(artifact_dir, exist_ok=True)
+    with open(_artifact_path(artifact_dir, TUNING_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def read_tuning(artifact_dir=ARTIFACT_DIR):
+    """The last tuning report, or None if there is none."""
+    try:
+        with open(_artifact_path(artifact_dir, TUNING_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def serving_params(fingerprint, artifact_dir=ARTIFACT_DIR):
+    """Hyperparameters of the price model: the tuned ones for this dataset, else RF_PARAMS.
+
+    With PRICE_MODEL_BACKEND=boosting the model is served with BOOSTING_PARAMS.
+    """
+    if PRICE_MODEL_BACKEND == "boosting":
+        return dict(BOOSTING_PARAMS)
+    tuning = read_tuning(artifact_dir)
+    if tuning is not None and tuning.get("fingerprint") == fingerprint and tuning.get("params"):
+        return tuning["params"]
+    return dict(RF_PARAMS)
+
+
+def is_fresh(meta, fingerprint, params):
+    return (meta is not None and meta.get("version") == ARTIFACT_VERSION
+            and meta.get("fingerprint") == fingerprint and meta.get("params") == params)
+
+
+def train_artifact(df, params=None, fingerprint=None, progress=None):
+    """Fit the price model on the whole dataset and bundle everything needed to serve it.
+
+    params with "backend": "boosting" train a BoostingRegressor, otherwise
+    a RandomForest. progress(fraction, message), when given, is told how many
+    trees are done.
+    """
+    params = dict(RF_PARAMS if params is None else params)
+    pipeline = FeaturePipeline().fit(df, track_stats=True)
+    X, y, _ = preprocess_data(df, pipeline)
+    if params.get("backend") == "boosting":
+        if progress is not None:
+            progress(0.05, "Gradient boosting eğitiliyor")
+        model_params = {k: v for k, v in params.items() if k != "backend"}
+        model = BoostingRegressor(**model_params).fit(X.to_numpy(np.float32), y.to_numpy())
+    else:
+        model = fit_forest(params, X, y, progress=scaled_progress(progress, 0.05, 0.95))
+    if progress is not None:
+        progress(0.95, "Tahmin motoru ve konum dizini hazırlanıyor")
+    artifact = {
+        "model": model,
+        "pipeline": pipeline,
+        "index": ListingIndex(df),
+        "feature_columns": pipeline.feature_columns_,
+        "fingerprint": fingerprint or dataset_fingerprint(df),
+        "params": params,
+        # Modelin kimliği; aynı veriyle farklı parametrelerle eğitilen modeller önbellekleri paylaşmaz
+        "model_id": uuid.uuid4().hex,
+    }
+    # Kompakt motor yalnızca orman içindir; boosting tahminleri doğrudan modelden alınır
+    if isinstance(model, RandomForestRegressor):
+        artifact["engine"] = CompactForest.from_sklearn(model)
+    return artifact
+
+
+def save_artifact(artifact, artifact_dir=ARTIFACT_DIR):
+    os.makedirs(artifact_dir, exist_ok=True)
+    # Sıkıştırmasız kaydediyoruz ki yüklerken memory-map kullanılabilsin. Dosya geçici adla yazılıp
+    # yerine taşınır; eşzamanlı okuyan oturumlar yarım yazılmış bir model görmez.
+    path = _artifact_path(artifact_dir, MODEL_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "fingerprint": artifact["fingerprint"],
+        "params": artifact["params"],
+        "model_id": artifact["model_id"],
+        "feature_columns": artifact["feature_columns"],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    # meta.json en son yazılır; yarım kalan bir kayıt eski sayılır.
+    path = _artifact_path(artifact_dir, META_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(artifact_dir=ARTIFACT_DIR, mmap_mode="r"):
+    return joblib.load(_artifact_path(artifact_dir, MODEL_FILE), mmap_mode=mmap_mode)
+
+
+def resolve_neighbourhoods(artifact, listings):
+    """Fill in neighbourhood from the coordinates where it is missing or unknown.
+
+    Rows that carry neighbourhood_encoded themselves are left alone.
+    """
+    index = artifact.get("index")
+    if index is None:
+        return listings
+    known = artifact["pipeline"].neighbourhood_means_.index
+    if "neighbourhood" in listings.columns:
+        missing = ~listings["neighbourhood"].astype(object).isin(known).to_numpy()
+    else:
+        missing = np.ones(len(listings), dtype=bool)
+    if "neighbourhood_encoded" in listings.columns:
+        missing &= listings["neighbourhood_encoded"].isna().to_numpy()
+    if not missing.any():
+        return listings
+    if "neighbourhood" in listings.columns:
+        names = listings["neighbourhood"].astype(object)
+    else:
+        names = pd.Series(None, index=listings.index, dtype=object)
+    rows = listings[missing]
+    names.loc[missing] = index.neighbourhoods(rows["latitude"].to_numpy(), rows["longitude"].to_numpy())
+    return listings.assign(neighbourhood=names)
+
+
+def predict_features(artifact, X):
+    """Price predictions for rows already transformed by the artifact's pipeline.
+
+    Small requests use the compact engine, which avoids sklearn's per-call
+    overhead; large batches use the sklearn forest, which is faster per row.
+    """
+    if len(X) <= ENGINE_MAX_ROWS and "engine" in artifact:
+        return artifact["engine"].predict(X)
+    return artifact["model"].predict(X)
+
+
+def predict_prices(artifact, listings):
+    """Price predictions for raw AB_NYC_2019-shaped rows, single or batch."""
+    X = artifact["pipeline"].transform(resolve_neighbourhoods(artifact, listings))
+    return predict_features(artifact, X)
+
+
+@instrumentation.timed()
+def load_or_train(df, params=None, artifact_dir=ARTIFACT_DIR, fingerprint=None, progress=None):
+    """Load the stored artifact, retraining only if the dataset or hyperparameters changed.
+
+    Without params the model is served with serving_params.
+    """
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    params = dict(serving_params(fingerprint, artifact_dir) if params is None else params)
+    fresh = is_fresh(read_meta(artifact_dir), fingerprint, params)
+    instrumentation.mark_cache(fresh)
+    if fresh:
+        return load_artifact(artifact_dir)
+    artifact = train_artifact(df, params, fingerprint, progress)
+    save_artifact(artifact, artifact_dir)
+    return artifact
+
+
+@instrumentation.timed()
+def ensure_artifact(df, params=None, artifact_dir=ARTIFACT_DIR, fingerprint=None, progress=None):
+    """Train and store the artifact if it is missing or stale; returns its metadata.
+
+    Unlike load_or_train the model is not kept in memory; the registry loads
+    it when a page needs it (see registry.CityRegistry.model).
+    """
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    params = dict(serving_params(fingerprint, artifact_dir) if params is None else params)
+    meta = read_meta(artifact_dir)
+    fresh = is_fresh(meta, fingerprint, params)
+    instrumentation.mark_cache(fresh)
+    if not fresh:
+        save_artifact(train_artifact(df, params, fingerprint, progress), artifact_dir)
+        meta = read_meta(artifact_dir)
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fiyat tahmin modelini eğitip artifact olarak kaydeder.")
+    parser.add_argument("--data", default="AB_NYC_2019.csv", help="AB_NYC_2019 formatında CSV dosyası")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--n-estimators", type=int, default=RF_PARAMS["n_estimators"])
+    parser.add_argument("--random-state", type=int, default=RF_PARAMS["random_state"])
+    parser.add_argument("--backend", choices=["forest", "boosting"], default=PRICE_MODEL_BACKEND)
+    parser.add_argument("--force", action="store_true", help="Artifact güncel olsa bile yeniden eğit")
+    args = parser.parse_args()
+
+    # Uygulama ile aynı parmak izini üretmek için veri önbellek üzerinden okunur
+    df = load_dataset(args.data)
+    if args.backend == "boosting":
+        params = dict(BOOSTING_PARAMS, random_state=args.random_state)
+    else:
+        params = {"n_estimators": args.n_estimators, "random_state": args.random_state}
+    fingerprint = dataset_fingerprint(df)
+
+    if not args.force and is_fresh(read_meta(args.artifact_dir), fingerprint, params):
+        print(f"Artifact güncel: {args.artifact_dir}")
+        return
+    start = time.perf_counter()
+    save_artifact(train_artifact(df, params, fingerprint), args.artifact_dir)
+    print(f"Model eğitildi ve kaydedildi: {args.artifact_dir} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
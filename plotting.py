@@ -0,0 +1,123 @@
+"""Shared plotting helpers.
+
+scatter draws a regular seaborn scatterplot for small inputs. Above
+DENSITY_THRESHOLD points it switches to a binned 2-D histogram image, which
+keeps render time and PNG size flat as the data grows. With hue, every bin is
+colored by the mix of its categories and shaded by its point count.
+
+sketch_histplot and sketch_boxplot draw the same charts as seaborn's histplot
+and boxplot from a stats.ColumnSketch, without touching the raw rows.
+"""
+import io
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib.colors import to_rgb
+from matplotlib.patches import Patch
+
+import instrumentation
+
+DENSITY_THRESHOLD = int(os.environ.get("SCATTER_DENSITY_THRESHOLD", 5000))
+DENSITY_BINS = 300
+
+
+@instrumentation.timed("render_png")
+def figure_png(fig):
+    """PNG bytes of a matplotlib figure; the figure is closed afterwards."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _extent(x, y):
+    x_min, x_max = np.nanmin(x), np.nanmax(x)
+    y_min, y_max = np.nanmin(y), np.nanmax(y)
+    if x_max == x_min:
+        x_max = x_min + 1
+    if y_max == y_min:
+        y_max = y_min + 1
+    return [x_min, x_max, y_min, y_max]
+
+
+def density_image(x, y, hue=None, bins=DENSITY_BINS, cmap="Blues", palette=None):
+    """RGBA image (bins x bins x 4), its extent and legend handles for a binned scatter."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    extent = _extent(x[valid], y[valid])
+    edges = [np.linspace(extent[0], extent[1], bins + 1), np.linspace(extent[2], extent[3], bins + 1)]
+
+    if hue is None:
+        counts, _, _ = np.histogram2d(x[valid], y[valid], bins=edges)
+        shade = np.log1p(counts.T) / max(np.log1p(counts.max()), 1e-12)
+        image = plt.get_cmap(cmap)(shade)
+        image[..., 3] = np.where(counts.T > 0, 0.25 + 0.75 * shade, 0)
+        return image, extent, []
+
+    hue = np.asarray(hue, dtype=object)[valid]
+    levels = sorted(set(hue.tolist()), key=str)
+    colors = sns.color_palette(palette, len(levels))
+    per_level = np.stack([np.histogram2d(x[valid][hue == level], y[valid][hue == level], bins=edges)[0].T
+                          for level in levels])
+    total = per_level.sum(axis=0)
+    # Her hücrenin rengi kategori renklerinin sayıya göre ağırlıklı ortalaması
+    weights = per_level / np.maximum(total, 1)
+    rgb = np.tensordot(weights, np.array([to_rgb(c) for c in colors]), axes=([0], [0]))
+    shade = np.log1p(total) / max(np.log1p(total.max()), 1e-12)
+    alpha = np.where(total > 0, 0.35 + 0.65 * shade, 0)
+    image = np.concatenate([rgb, alpha[..., None]], axis=2)
+    handles = [Patch(color=c, label=str(level)) for level, c in zip(levels, colors)]
+    return image, extent, handles
+
+
+def scatter(ax, x, y, hue=None, alpha=None, threshold=None, bins=DENSITY_BINS):
+    """Scatterplot that becomes a density image above threshold points."""
+    threshold = DENSITY_THRESHOLD if threshold is None else threshold
+    if len(x) <= threshold:
+        sns.scatterplot(x=x, y=y, hue=hue, alpha=alpha, ax=ax)
+        return ax
+    image, extent, handles = density_image(x, y, hue, bins)
+    ax.imshow(image, origin="lower", extent=extent, aspect="auto", interpolation="nearest")
+    if getattr(x, "name", None):
+        ax.set_xlabel(x.name)
+    if getattr(y, "name", None):
+        ax.set_ylabel(y.name)
+    if handles:
+        ax.legend(handles=handles, title=getattr(hue, "name", None))
+    return ax
+
+
+def _smooth(counts, sigma_bins=1.5):
+    """Gaussian-smoothed counts; stands in for a KDE curve over binned data."""
+    radius = int(np.ceil(3 * sigma_bins))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma_bins) ** 2)
+    kernel /= kernel.sum()
+    return np.convolve(np.pad(counts, radius, mode="constant"), kernel, mode="valid")
+
+
+def sketch_histplot(ax, sketch, bins=50, kde=True, color=None, label_lines=True):
+    """Histogram of a ColumnSketch with mean/median lines, like sns.histplot(kde=True)."""
+    counts, edges = sketch.histogram(bins)
+    color = color or sns.color_palette()[0]
+    ax.stairs(counts, edges, fill=True, color=color, alpha=0.6, edgecolor="white")
+    if kde:
+        centers = (edges[:-1] + edges[1:]) / 2
+        ax.plot(centers, _smooth(counts), color=color, linewidth=2)
+    if label_lines:
+        ax.axvline(sketch.mean, color="red", linestyle="dashed", linewidth=2, label="ortalama")
+        ax.axvline(sketch.median, color="blue", linestyle="dashed", linewidth=2, label="median")
+        ax.legend()
+    ax.set_ylabel("Count")
+    return ax
+
+
+def sketch_boxplot(ax, sketch, color=None):
+    """Horizontal box plot of a ColumnSketch (quartiles and 1.5 IQR whiskers)."""
+    box = ax.bxp([sketch.box_stats()], vert=False, showfliers=False, patch_artist=True, widths=0.6)
+    for patch in box["boxes"]:
+        patch.set_facecolor(color or sns.color_palette()[0])
+    ax.set_yticks([])
+    return ax
@@ -0,0 +1,302 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import yeojohnson
+from sklearn.preprocessing import PowerTransformer
+
+import instrumentation
+
+DROP_COLUMNS = ["id", "name", "host_id", "host_name", "last_review"]
+CATEGORICAL_COLUMNS = ["neighbourhood_group", "room_type"]
+NUMERIC_COLUMNS = ["latitude", "longitude", "minimum_nights", "number_of_reviews", "reviews_per_month",
+                   "calculated_host_listings_count", "availability_365"]
+# Parça parça okuma için gereken ham sütunlar (metin sütunları belleğe hiç alınmaz)
+SOURCE_COLUMNS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS + ["neighbourhood", "price"]
+# Akış modunda Yeo-Johnson lambda'sı bu ızgara üzerinde seçilir
+YJ_LAMBDA_GRID = np.round(np.arange(-2.0, 2.0 + 1e-9, 0.01), 2)
+
+
+class YeoJohnsonStats:
+    """Mergeable sufficient statistics for fitting Yeo-Johnson on a stream.
+
+    For every lambda on the grid it keeps the count, sum and sum of squares of
+    the transformed values, plus the sum of sign(x) * log1p(|x|). That is all
+    the log-likelihood needs, so chunks can be added in any order and the
+    best lambda (with its mean and scale) is read off at the end.
+    """
+
+    def __init__(self, lambdas=YJ_LAMBDA_GRID):
+        self.lambdas = np.asarray(lambdas, dtype=float)
+        self.n = 0
+        self.sums = np.zeros(len(self.lambdas))
+        self.sq_sums = np.zeros(len(self.lambdas))
+        self.log_term = 0.0
+
+    def update(self, x):
+        x = np.asarray(x, dtype=float)
+        x = np.where(np.isnan(x), 0.0, x)
+        if not len(x):
+            return self
+        sums = np.empty(len(self.lambdas))
+        sq_sums = np.empty(len(self.lambdas))
+        for i, lmbda in enumerate(self.lambdas):
+            psi = yeojohnson(x, lmbda)
+            sums[i] = psi.sum()
+            sq_sums[i] = np.dot(psi, psi)
+        # Yerinde toplama yapılmaz; memory-map ile yüklenmiş (salt okunur) diziler de güncellenebilsin
+        self.sums = self.sums + sums
+        self.sq_sums = self.sq_sums + sq_sums
+        self.n += len(x)
+        self.log_term += float(np.sum(np.sign(x) * np.log1p(np.abs(x))))
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.sums = self.sums + other.sums
+        self.sq_sums = self.sq_sums + other.sq_sums
+        self.log_term += other.log_term
+        return self
+
+    def fitted(self):
+        """(lambda, mean, scale) maximizing the Yeo-Johnson log-likelihood."""
+        means = self.sums / self.n
+        variances = np.maximum(self.sq_sums / self.n - means ** 2, 1e-300)
+        loglik = -0.5 * self.n * np.log(variances) + (self.lambdas - 1) * self.log_term
+        best = int(np.argmax(loglik))
+        return float(self.lambdas[best]), float(means[best]), float(np.sqrt(variances[best])) or 1.0
+
+
+class PipelineStats:
+    """Everything FeaturePipeline learns, accumulated chunk by chunk."""
+
+    def __init__(self):
+        self.reviews = YeoJohnsonStats()
+        self.neighbourhood_sums = pd.Series(dtype=float)
+        self.neighbourhood_counts = pd.Series(dtype=float)
+        self.levels = {col: set() for col in CATEGORICAL_COLUMNS}
+        self.price_sum = 0.0
+        self.price_count = 0
+
+    def update(self, df):
+        self.reviews.update(df["reviews_per_month"])
+        grouped = df["price"].astype(float).groupby(df["neighbourhood"].astype(object))
+        self.neighbourhood_sums = self.neighbourhood_sums.add(grouped.sum(), fill_value=0)
+        self.neighbourhood_counts = self.neighbourhood_counts.add(grouped.count(), fill_value=0)
+        for col in CATEGORICAL_COLUMNS:
+            self.levels[col].update(df[col].dropna().unique())
+        self.price_sum += float(df["price"].sum())
+        self.price_count += int(df["price"].count())
+        return self
+
+    def merge(self, other):
+        self.reviews.merge(other.reviews)
+        self.neighbourhood_sums = self.neighbourhood_sums.add(other.neighbourhood_sums, fill_value=0)
+        self.neighbourhood_counts = self.neighbourhood_counts.add(other.neighbourhood_counts, fill_value=0)
+        for col in CATEGORICAL_COLUMNS:
+            self.levels[col].update(other.levels[col])
+        self.price_sum += other.price_sum
+        self.price_count += other.price_count
+        return self
+
+
+class FeaturePipeline:
+    """Fit/transform version of preprocess_data.
+
+    fit learns the Yeo-Johnson parameters of reviews_per_month, the category
+    levels and the neighbourhood -> mean price table; transform only applies
+    them, so single rows and batches get exactly the training features.
+    """
+
+    def fit(self, df, track_stats=False):
+        """Fit on an in-memory frame.
+
+        With track_stats=True the streaming statistics are kept as well, so the
+        pipeline can later be updated with partial_fit.
+        """
+        self.stats_ = PipelineStats().update(df) if track_stats else None
+        power_transformer = PowerTransformer(method='yeo-johnson', standardize=False)
+        reviews_transformed = power_transformer.fit_transform(df["reviews_per_month"].fillna(0).values.reshape(-1, 1))
+        self.reviews_lambda_ = float(power_transformer.lambdas_[0])
+        self.reviews_mean_ = float(reviews_transformed.mean())
+        self.reviews_scale_ = float(reviews_transformed.std()) or 1.0
+
+        self.category_levels_ = {col: sorted(df[col].dropna().unique()) for col in CATEGORICAL_COLUMNS}
+        # Ortalamalar sıfır fiyatlı ilanlar çıkarılmadan önce hesaplanır (preprocess_data ile aynı).
+        self.neighbourhood_means_ = df.groupby("neighbourhood", observed=True)["price"].mean()
+        self.neighbourhood_means_.index = self.neighbourhood_means_.index.astype(object)
+        self.global_mean_price_ = float(df["price"].mean())
+        self._set_feature_columns()
+        return self
+
+    def fit_chunks(self, chunks):
+        """Fit from an iterable of DataFrame chunks in a single pass with bounded memory.
+
+        The Yeo-Johnson lambda is chosen on YJ_LAMBDA_GRID, so it can differ
+        slightly from fit on the same data.
+        """
+        stats = PipelineStats()
+        for chunk in chunks:
+            stats.update(chunk)
+        return self.fit_stats(stats)
+
+    def fit_stats(self, stats, category_levels=None):
+        self.stats_ = stats
+        self.reviews_lambda_, self.reviews_mean_, self.reviews_scale_ = stats.reviews.fitted()
+        self.category_levels_ = category_levels or {col: sorted(stats.levels[col]) for col in CATEGORICAL_COLUMNS}
+        self.neighbourhood_means_ = stats.neighbourhood_sums / stats.neighbourhood_counts
+        self.global_mean_price_ = stats.price_sum / max(stats.price_count, 1)
+        self._set_feature_columns()
+        return self
+
+    def partial_fit(self, df):
+        """Fold new rows into the running statistics and refresh the fitted parameters.
+
+        Cost depends only on len(df). Category levels, and with them the output
+        columns, stay fixed so models trained on earlier features keep working.
+        """
+        if getattr(self, "stats_", None) is None:
+            raise ValueError("partial_fit için pipeline fit(track_stats=True) veya fit_chunks ile eğitilmeli")
+        self.stats_.update(df)
+        return self.fit_stats(self.stats_, category_levels=self.category_levels_)
+
+    def _set_feature_columns(self):
+        self.feature_columns_ = list(NUMERIC_COLUMNS)
+        for col in CATEGORICAL_COLUMNS:
+            # drop_first=True: ilk seviye referans kategori olarak atlanır.
+            self.feature_columns_ += [f"{col}_{level}" for level in self.category_levels_[col][1:]]
+        self.feature_columns_ += ["neighbourhood_encoded", "minimum_nights_log", "review_score"]
+
+    def transform_reviews(self, reviews_per_month):
+        reviews = np.asarray(reviews_per_month, dtype=float)
+        reviews = np.where(np.isnan(reviews), 0.0, reviews)
+        return (yeojohnson(reviews, self.reviews_lambda_) - self.reviews_mean_) / self.reviews_scale_
+
+    def inverse_transform_reviews(self, reviews_transformed):
+        y = np.asarray(reviews_transformed, dtype=float) * self.reviews_scale_ + self.reviews_mean_
+        lmbda = self.reviews_lambda_
+        out = np.empty_like(y)
+        pos = y >= 0
+        if abs(lmbda) < 1e-8:
+            out[pos] = np.expm1(y[pos])
+        else:
+            out[pos] = np.power(y[pos] * lmbda + 1, 1 / lmbda) - 1
+        if abs(lmbda - 2) < 1e-8:
+            out[~pos] = -np.expm1(-y[~pos])
+        else:
+            out[~pos] = 1 - np.power(-(2 - lmbda) * y[~pos] + 1, 1 / (2 - lmbda))
+        return out
+
+    def encode_neighbourhood(self, df):
+        """Mean price of each row's neighbourhood; unseen ones get the global mean.
+
+        Rows without a neighbourhood name may carry neighbourhood_encoded directly,
+        as the prediction page does.
+        """
+        if "neighbourhood" in df.columns:
+            encoded = df["neighbourhood"].astype(object).map(self.neighbourhood_means_).astype(float)
+        else:
+            encoded = pd.Series(np.nan, index=df.index)
+        if "neighbourhood_encoded" in df.columns:
+            encoded = encoded.fillna(df["neighbourhood_encoded"].astype(float))
+        return encoded.fillna(self.global_mean_price_)
+
+    def transform(self, df):
+        X = pd.DataFrame(index=df.index)
+        for col in NUMERIC_COLUMNS:
+            X[col] = df[col]
+        X["reviews_per_month"] = self.transform_reviews(df["reviews_per_month"])
+        for col in CATEGORICAL_COLUMNS:
+            values = df[col].to_numpy()
+            for level in self.category_levels_[col][1:]:
+                X[f"{col}_{level}"] = values == level
+        X["neighbourhood_encoded"] = self.encode_neighbourhood(df)
+        X["minimum_nights_log"] = np.log1p(df["minimum_nights"].astype(float))
+        X["review_score"] = X["reviews_per_month"] * df["number_of_reviews"]
+        return X[self.feature_columns_]
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+
+@instrumentation.timed()
+def preprocess_data(df, pipeline=None):
+    """Training features, target and the full processed frame used by the EDA pages.
+
+    A fitted pipeline can be passed in to reuse its parameters instead of refitting.
+    """
+    if pipeline is None:
+        pipeline = FeaturePipeline().fit(df)
+    mask = (df["price"] > 0).to_numpy()
+    X = pipeline.transform(df[mask])
+    y = df.loc[mask, "price"]
+
+    processed_df = X.copy()
+    processed_df["price"] = y
+    processed_df["reviews_per_month_original"] = pipeline.inverse_transform_reviews(X["reviews_per_month"])
+    processed_df["log_price"] = np.log1p(y.astype(float))
+
+    return X, y, processed_df
+
+
+def read_csv_chunks(paths, chunksize=100_000):
+    """Factory of fresh chunk iterators over one or more AB_NYC_2019-shaped CSVs.
+
+    Each call starts a new pass; only the columns the pipeline needs are read.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    def chunks():
+        for path in paths:
+            yield from pd.read_csv(path, usecols=lambda c: c in SOURCE_COLUMNS, chunksize=chunksize)
+
+    return chunks
+
+
+def preprocess_chunks(read_chunks, pipeline=None):
+    """Out-of-core preprocess_data: yields (X, y) per chunk.
+
+    The first pass over read_chunks() fits the pipeline (skipped when a fitted
+    one is given); the second pass transforms. Peak memory depends on the chunk
+    size, not on the dataset size.
+    """
+    if pipeline is None:
+        pipeline = FeaturePipeline().fit_chunks(read_chunks())
+    for chunk in read_chunks():
+        mask = (chunk["price"] > 0).to_numpy()
+        yield pipeline.transform(chunk[mask]), chunk.loc[mask, "price"]
+
+
+def main():
+    import argparse
+    import time
+
+    from batch_score import open_sink
+
+    parser = argparse.ArgumentParser(description="Büyük / çok şehirli veri setlerini parça parça ön işler.")
+    parser.add_argument("inputs", nargs="+", help="AB_NYC_2019 formatında CSV dosyaları")
+    parser.add_argument("--output", required=True, help="Özellik dosyası (.parquet veya .csv)")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    read_chunks = read_csv_chunks(args.inputs, args.chunksize)
+    start = time.perf_counter()
+    pipeline = FeaturePipeline().fit_chunks(read_chunks())
+    print(f"1. geçiş: {time.perf_counter() - start:.1f} s, lambda={pipeline.reviews_lambda_:.2f}, "
+          f"{len(pipeline.neighbourhood_means_)} mahalle")
+
+    sink = open_sink(args.output)
+    rows = 0
+    try:
+        for X, y in preprocess_chunks(read_chunks, pipeline):
+            # Parçalar arasında şema sabit kalsın diye tüm sütunlar float64 yazılır
+            out = X.astype("float64")
+            out["price"] = y.astype("float64")
+            sink.write(out)
+            rows += len(out)
+    finally:
+        sink.close()
+    print(f"2. geçiş: {rows} satır yazıldı, toplam {time.perf_counter() - start:.1f} s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
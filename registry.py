@@ -0,0 +1,232 @@
+"""Registry of the cities served by the app.
+
+cities.json describes every city: its listings CSV, the directory of its
+price model artifact, the map center and zoom, the default location of the
+prediction form and, optionally, the category levels offered in the forms
+(levels missing from the file are taken from the data):
+
+    {"nyc": {"name": "New York", "data": "AB_NYC_2019.csv", "artifact_dir": "artifacts",
+             "center": [40.76586, -73.98436], "zoom": 11, "default_location": [40.75, -73.98],
+             "neighbourhood_groups": ["Brooklyn", "Manhattan", ...]}}
+
+Without the file only New York is registered, with the defaults the app has
+always used. Listings and model artifacts are loaded on first use and kept in
+one process-wide LRU cache bounded by CITY_CACHE_MAX_MB; loading a city that
+pushes the total over the limit evicts the least recently used entries, so
+memory stays flat however many cities are registered.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import instrumentation
+
+CITIES_FILE = os.environ.get("CITIES_FILE", "cities.json")
+CITY_CACHE_MAX_MB = float(os.environ.get("CITY_CACHE_MAX_MB", 1024))
+DEFAULT_CITY = "nyc"
+
+_NYC = {
+    "name": "New York",
+    "data": "AB_NYC_2019.csv",
+    "artifact_dir": "artifacts",
+    "center": [40.76586, -73.98436],
+    "zoom": 11,
+    "default_location": [40.75, -73.98],
+    "neighbourhood_groups": ["Brooklyn", "Manhattan", "Queens", "Staten Island", "Bronx"],
+    "room_types": ["Private room", "Entire home/apt", "Shared room"],
+}
+
+
+class City:
+    """Configuration of one city; data and model are loaded through the registry."""
+
+    def __init__(self, key, name, data, artifact_dir, center, zoom=11, default_location=None,
+                 neighbourhood_groups=None, room_types=None):
+        self.key = key
+        self.name = name
+        self.data = data
+        self.artifact_dir = artifact_dir
+        self.center = list(center)
+        self.zoom = zoom
+        self.default_location = list(default_location or center)
+        self.neighbourhood_groups = neighbourhood_groups
+        self.room_types = room_types
+
+    @classmethod
+    def from_dict(cls, key, config):
+        return cls(key, **config)
+
+    def levels(self, column, df):
+        """Category levels of column offered in the forms: configured, else those in df."""
+        configured = {"neighbourhood_group": self.neighbourhood_groups, "room_type": self.room_types}.get(column)
+        if configured:
+            return list(configured)
+        return sorted(df[column].dropna().astype(str).unique())
+
+
+def read_cities(path=CITIES_FILE):
+    """{key: City} from the registry file, or just New York if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except OSError:
+        config = {DEFAULT_CITY: _NYC}
+    return {key: City.from_dict(key, value) for key, value in config.items()}
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def artifact_nbytes(artifact_dir):
+    # Artifact memory-map ile açılır; dosya boyutu bellekteki payı için üst sınırdır
+    from model_store import MODEL_FILE
+    try:
+        return os.path.getsize(os.path.join(artifact_dir, MODEL_FILE))
+    except OSError:
+        return 0
+
+
+class StaleModelError(RuntimeError):
+    """The artifact on disk is not the model the caller's metadata describes."""
+
+
+class SizedLRU:
+    """Thread-safe LRU cache bounded by the total size of its values.
+
+    get_or_load runs a key's loader once even when several sessions ask for it
+    at the same time. A value larger than the whole budget is still kept, as
+    the only entry.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get_or_load(self, key, loader, sizer):
+        """Cached value of key, calling loader() and sizing it with sizer(value) on a miss."""
+        value = self._get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                # Aynı anahtarı bekleyen oturumlar ilk yüklemenin sonucunu kullanır
+                value = self._get(key)
+                if value is not None:
+                    return value
+                with self._lock:
+                    self.misses += 1
+                instrumentation.mark_cache(False)
+                value = loader()
+                self.put(key, value, sizer(value))
+                return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        instrumentation.mark_cache(True)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            self._entries[key] = (value, nbytes)
+            self._entries.move_to_end(key)
+            total = sum(size for _, size in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, (_, size) = self._entries.popitem(last=False)
+                total -= size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "mb": sum(s for _, s in self._entries.values()) / 2 ** 20,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class CityRegistry:
+    """Registered cities plus the shared cache of their listings and price models."""
+
+    def __init__(self, cities=None, max_mb=CITY_CACHE_MAX_MB):
+        self.cities = read_cities() if cities is None else cities
+        self.cache = SizedLRU(int(max_mb * 2 ** 20))
+
+    def city(self, key):
+        return self.cities[key]
+
+    @instrumentation.timed("city_dataset")
+    def dataset(self, key):
+        """(listings, fingerprint) of the city, read through the Feather cache on first use.
+
+        The fingerprint (data_cache.dataset_fingerprint) is computed once per
+        load, so pages can key their caches and jobs on it without hashing the
+        frame on every rerun.
+        """
+        from data_cache import dataset_fingerprint, load_dataset
+
+        def load():
+            df = load_dataset(self.city(key).data)
+            return df, dataset_fingerprint(df)
+
+        return self.cache.get_or_load(("data", key), load, lambda data: frame_nbytes(data[0]))
+
+    @instrumentation.timed("city_model")
+    def model(self, key, meta):
+        """The city's stored price model artifact, loaded memory-mapped on first use.
+
+        meta is the artifact's metadata (see model_store.ensure_artifact); a
+        retrained model gets a new cache entry instead of the stale one. If the
+        file on disk has meanwhile been replaced by another model, that model
+        is loaded under its own model_id; a mismatch is never cached.
+        """
+        from model_store import read_meta
+
+        city = self.city(key)
+        try:
+            return self._model(city, meta["model_id"])
+        except StaleModelError:
+            # Diskteki model başka bir iş tarafından yeniden eğitilmiş; güncel meta ile bir kez daha denenir
+            current = read_meta(city.artifact_dir)
+            if current is None or current.get("model_id") in (None, meta["model_id"]):
+                raise
+            return self._model(city, current["model_id"])
+
+    def _model(self, city, model_id):
+        from model_store import load_artifact
+
+        def load():
+            artifact = load_artifact(city.artifact_dir)
+            if artifact.get("model_id") != model_id:
+                raise StaleModelError(f"{city.artifact_dir}: beklenen model {model_id}, "
+                                      f"diskteki {artifact.get('model_id')}")
+            return artifact
+
+        return self.cache.get_or_load(("model", city.key, model_id), load,
+                                      lambda _: artifact_nbytes(city.artifact_dir))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry shared by every session."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CityRegistry()
+        return _registry
@@ -0,0 +1,212 @@
+"""Standalone JSON prediction service.
+
+Loads the stored model artifact once and merges concurrent requests into
+micro-batches so a single predict call serves many callers:
+
+    python serve.py --port 8000 --max-batch-size 64 --max-wait-ms 5
+
+    POST /predict        {"latitude": 40.75, "longitude": -73.98, ...}  -> {"price": 123.4}
+    POST /predict/batch  [{...}, {...}]                                 -> {"prices": [...]}
+    GET  /health
+"""
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from model_store import ARTIFACT_DIR, load_artifact, predict_prices
+from preprocessing import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+
+REQUIRED_FIELDS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+
+
+def validate_listing(listing):
+    """Return an error message for an unusable listing, or None."""
+    if not isinstance(listing, dict):
+        return "her ilan bir JSON nesnesi olmalı"
+    # neighbourhood verilmezse koordinatlardan bulunur
+    missing = [f for f in REQUIRED_FIELDS if f not in listing]
+    if missing:
+        return "eksik alanlar: " + ", ".join(missing)
+    # bool da int sayıldığı için ayrıca dışlanır
+    invalid = [f for f in NUMERIC_COLUMNS
+               if isinstance(listing[f], bool) or not isinstance(listing[f], (int, float))
+               or not math.isfinite(listing[f])]
+    if invalid:
+        return "sonlu sayı olmalı: " + ", ".join(invalid)
+    invalid = [f for f in CATEGORICAL_COLUMNS if not isinstance(listing[f], str)]
+    if listing.get("neighbourhood") is not None and not isinstance(listing["neighbourhood"], str):
+        invalid.append("neighbourhood")
+    if invalid:
+        return "metin olmalı: " + ", ".join(invalid)
+    return None
+
+
+class MicroBatcher:
+    """Collects rows from concurrent callers and scores them together.
+
+    A batch is flushed when it reaches max_batch_size rows or when the oldest
+    request has waited max_wait_ms, whichever comes first.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, listings):
+        """Queue a list of listings; the returned Future resolves to their prices."""
+        future = Future()
+        self._queue.put((listings, future))
+        return future
+
+    def predict(self, listings, timeout=None):
+        return self.submit(listings).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _score_each(self, batch):
+        # Toplu tahmin başarısız olursa her çağıran ayrı puanlanır; hatalı girdi yalnızca sahibini etkiler
+        for listings, future in batch:
+            try:
+                future.set_result(self.predict_fn(pd.DataFrame(listings)).tolist())
+            except Exception as e:
+                future.set_exception(e)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            rows = [listing for listings, _ in batch for listing in listings]
+            try:
+                prices = self.predict_fn(pd.DataFrame(rows)).tolist()
+            except Exception as e:
+                if len(batch) > 1:
+                    self._score_each(batch)
+                else:
+                    batch[0][1].set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(rows)
+            offset = 0
+            for listings, future in batch:
+                future.set_result(prices[offset:offset + len(listings)])
+                offset += len(listings)
+
+
+def make_handler(batcher, timeout=30.0):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "batches": batcher.batches, "rows": batcher.rows})
+            else:
+                self._send(404, {"error": "bulunamadı"})
+
+        def do_POST(self):
+            if self.path not in ("/predict", "/predict/batch"):
+                self._send(404, {"error": "bulunamadı"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+            except ValueError:
+                self._send(400, {"error": "geçersiz JSON"})
+                return
+
+            single = self.path == "/predict"
+            if single:
+                listings = [payload]
+            elif isinstance(payload, dict) and "listings" in payload:
+                listings = payload["listings"]
+            else:
+                listings = payload
+            if not isinstance(listings, list) or not listings:
+                self._send(400, {"error": "ilan listesi bekleniyordu"})
+                return
+            for i, listing in enumerate(listings):
+                error = validate_listing(listing)
+                if error:
+                    self._send(400, {"error": error, "index": i})
+                    return
+
+            try:
+                prices = batcher.predict(listings, timeout)
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {"price": prices[0]} if single else {"prices": prices})
+
+    return PredictionHandler
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Varsayılan kuyruk (5) eşzamanlı bağlantı patlamalarında bağlantı reddine yol açıyor.
+    request_queue_size = 128
+
+
+def make_server(artifact, host="127.0.0.1", port=8000, max_batch_size=64, max_wait_ms=5.0):
+    batcher = MicroBatcher(lambda df: predict_prices(artifact, df), max_batch_size, max_wait_ms)
+    server = PredictionServer((host, port), make_handler(batcher))
+    return server, batcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fiyat tahmin modelini HTTP üzerinden sunar.")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server, _ = make_server(load_artifact(args.artifact_dir), args.host, args.port,
+                            args.max_batch_size, args.max_wait_ms)
+    print(f"Tahmin servisi http://{args.host}:{args.port} adresinde çalışıyor")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
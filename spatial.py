@@ -0,0 +1,113 @@
+"""Spatial aggregation of listings.
+
+build_pyramid bins every listing into a latitude/longitude grid at several
+zoom levels and computes count, mean price and median price per cell in one
+vectorized pass per level. Maps draw from these cells, so their payload
+depends on the grid size, not on the number of listings.
+"""
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+PYRAMID_ZOOMS = (10, 11, 12, 13)
+
+
+def cell_size(zoom):
+    """Cell edge in degrees; halves with every zoom level (~2 km at zoom 10)."""
+    return 20.0 / 2 ** zoom
+
+
+def aggregate_grid(lat, lon, price, size):
+    """Per-cell count, mean and median price for a grid of size x size degree cells."""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    price = np.asarray(price, dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(price)
+    lat, lon, price = lat[valid], lon[valid], price[valid]
+
+    cells = np.stack([np.floor(lat / size), np.floor(lon / size)], axis=1).astype(np.int64)
+    keys, cell_ids = np.unique(cells, axis=0, return_inverse=True)
+    cell_ids = cell_ids.ravel()
+    counts = np.bincount(cell_ids, minlength=len(keys))
+    means = np.bincount(cell_ids, weights=price, minlength=len(keys)) / counts
+
+    # Medyan: hücre ve fiyata göre sırala, her hücrenin ortadaki elemanlarını al
+    order = np.lexsort((price, cell_ids))
+    sorted_price = price[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    lower = sorted_price[starts + (counts - 1) // 2]
+    upper = sorted_price[starts + counts // 2]
+
+    return pd.DataFrame({
+        "latitude": (keys[:, 0] + 0.5) * size,
+        "longitude": (keys[:, 1] + 0.5) * size,
+        "count": counts,
+        "mean_price": means,
+        "median_price": (lower + upper) / 2,
+    })
+
+
+@instrumentation.timed()
+def build_pyramid(df, zooms=PYRAMID_ZOOMS):
+    """{zoom: cell DataFrame} for every zoom level."""
+    lat = df["latitude"].to_numpy(dtype=float)
+    lon = df["longitude"].to_numpy(dtype=float)
+    price = df["price"].to_numpy(dtype=float)
+    return {zoom: aggregate_grid(lat, lon, price, cell_size(zoom)) for zoom in zooms}
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class ListingIndex:
+    """BallTree (haversine) over listing coordinates.
+
+    Resolves the neighbourhood of arbitrary coordinates from the nearest
+    listings and returns comparable listings of the same room type. Built once
+    per dataset and stored with the model artifact.
+    """
+
+    def __init__(self, df):
+        from sklearn.neighbors import BallTree
+
+        df = df[np.isfinite(df["latitude"].to_numpy(dtype=float)) & np.isfinite(df["longitude"].to_numpy(dtype=float))]
+        coords = np.radians(df[["latitude", "longitude"]].to_numpy(dtype=float))
+        self.tree = BallTree(coords, metric="haversine")
+        neighbourhoods = df["neighbourhood"].astype(str).to_numpy()
+        self.neighbourhood_levels, self.neighbourhood_codes = np.unique(neighbourhoods, return_inverse=True)
+        self.price = df["price"].to_numpy(dtype=float)
+
+        self.room_trees = {}
+        room_types = df["room_type"].astype(str).to_numpy()
+        for room_type in np.unique(room_types):
+            rows = np.flatnonzero(room_types == room_type)
+            self.room_trees[room_type] = (BallTree(coords[rows], metric="haversine"), rows)
+        self.listings = df[["latitude", "longitude", "neighbourhood", "room_type", "price"]].reset_index(drop=True)
+
+    def extend(self, df):
+        """A new index over these listings plus those of df."""
+        columns = list(self.listings.columns)
+        return ListingIndex(pd.concat([self.listings, df[columns]], ignore_index=True))
+
+    def neighbourhoods(self, latitude, longitude, k=5):
+        """Most common neighbourhood among the k nearest listings of each point."""
+        points = np.radians(np.column_stack([np.atleast_1d(latitude), np.atleast_1d(longitude)]).astype(float))
+        k = min(k, len(self.price))
+        _, idx = self.tree.query(points, k=k)
+        codes = self.neighbourhood_codes[idx]
+        # Satır başına mod; eşitlikte en yakın komşunun mahallesi kazanır
+        votes = (codes[:, :, None] == codes[:, None, :]).sum(axis=2)
+        winner = codes[np.arange(len(codes)), np.argmax(votes, axis=1)]
+        return self.neighbourhood_levels[winner]
+
+    def comparables(self, latitude, longitude, room_type, k=10):
+        """The k nearest listings with the same room type, closest first."""
+        if room_type not in self.room_trees:
+            return self.listings.iloc[:0].assign(distance_km=[])
+        tree, rows = self.room_trees[room_type]
+        k = min(k, len(rows))
+        dist, idx = tree.query(np.radians([[latitude, longitude]]), k=k)
+        result = self.listings.iloc[rows[idx[0]]].copy()
+        result["distance_km"] = dist[0] * EARTH_RADIUS_KM
+        return result.reset_index(drop=True)
@@ -0,0 +1,191 @@
+"""One-pass, mergeable summary statistics for the EDA pages.
+
+DatasetSketch scans a frame (or a stream of chunks) once and keeps, per
+column, the null count; for numeric columns also count, mean, variance,
+min/max and a relative-error quantile sketch, from which medians, box plots
+and fixed-bin histograms are derived. Sketches of different chunks can be
+merged, so the same summaries work for out-of-core data.
+
+Quantile error is relative to the value's magnitude, so the sketch suits
+prices, counts and standardised features, not narrow-range columns such as
+coordinates far from zero.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Sıfır kabul edilen en küçük mutlak değer
+MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch) with a relative accuracy guarantee.
+
+    Every quantile it returns is within relative_accuracy of a true data value
+    of that rank. Buckets are plain counts, so two sketches merge by addition.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _add(self, store, magnitudes):
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        positive = values[values > MIN_INDEXABLE]
+        negative = -values[values < -MIN_INDEXABLE]
+        self._add(self.positive, positive)
+        self._add(self.negative, negative)
+        self.zeros += len(values) - len(positive) - len(negative)
+        self.count += len(values)
+        return self
+
+    def merge(self, other):
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def _value(self, keys):
+        return 2 * np.power(self.gamma, keys) / (self.gamma + 1)
+
+    def buckets(self):
+        """Representative values and counts of all buckets, sorted by value."""
+        neg_keys = np.array(sorted(self.negative, reverse=True), dtype=float)
+        pos_keys = np.array(sorted(self.positive), dtype=float)
+        values = np.concatenate([-self._value(neg_keys), [0.0] if self.zeros else [], self._value(pos_keys)])
+        counts = np.concatenate([[self.negative[k] for k in sorted(self.negative, reverse=True)],
+                                 [self.zeros] if self.zeros else [],
+                                 [self.positive[k] for k in sorted(self.positive)]]).astype(float)
+        return values, counts
+
+    def quantile(self, q):
+        if not self.count:
+            return np.nan
+        values, counts = self.buckets()
+        rank = np.asarray(q, dtype=float) * (self.count - 1)
+        return values[np.searchsorted(np.cumsum(counts), rank, side="right")]
+
+
+class ColumnSketch:
+    """Nulls, moments, extrema and quantiles of one numeric column."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.nulls = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = QuantileSketch(relative_accuracy)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        # Chan vd. paralel varyans birleştirmesi
+        total = self.count + count
+        if not count:
+            return
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        finite = values[np.isfinite(values)]
+        self.nulls += int(np.isnan(values).sum())
+        if len(finite):
+            mean = finite.mean()
+            self._combine(len(finite), mean, float(((finite - mean) ** 2).sum()), finite.min(), finite.max())
+            self.quantiles.update(finite)
+        return self
+
+    def merge(self, other):
+        self.nulls += other.nulls
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self.quantiles.merge(other.quantiles)
+        return self
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    @property
+    def median(self):
+        return float(self.quantiles.quantile(0.5))
+
+    def quantile(self, q):
+        return self.quantiles.quantile(q)
+
+    def histogram(self, bins=50):
+        """Counts and edges of bins equal-width bins between min and max."""
+        edges = np.linspace(self.min, self.max if self.max > self.min else self.min + 1, bins + 1)
+        values, counts = self.quantiles.buckets()
+        # Temsilci değerler min/max dışına taşabilir; uç kutulara kırpılır
+        idx = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+        return np.bincount(idx, weights=counts, minlength=bins), edges
+
+    def box_stats(self, whis=1.5):
+        """Box plot statistics in the format of matplotlib's Axes.bxp."""
+        q1, med, q3 = (float(v) for v in self.quantile([0.25, 0.5, 0.75]))
+        iqr = q3 - q1
+        return {"med": med, "q1": q1, "q3": q3,
+                "whislo": max(self.min, q1 - whis * iqr), "whishi": min(self.max, q3 + whis * iqr),
+                "fliers": []}
+
+
+class DatasetSketch:
+    """Per-column sketches of a whole frame, built in one pass and mergeable."""
+
+    def __init__(self, columns=None, relative_accuracy=0.01):
+        self.numeric_columns = columns
+        self.relative_accuracy = relative_accuracy
+        self.rows = 0
+        self.nulls = pd.Series(dtype="int64")
+        self.columns = {}
+
+    def update(self, df):
+        self.rows += len(df)
+        self.nulls = self.nulls.add(df.isna().sum(), fill_value=0).astype("int64")
+        for col in self.numeric_columns or df.columns:
+            if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype):
+                sketch = self.columns.setdefault(col, ColumnSketch(self.relative_accuracy))
+                sketch.update(df[col].to_numpy(dtype=float, na_value=np.nan))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.nulls = self.nulls.add(other.nulls, fill_value=0).astype("int64")
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                # Kopyalanır; sonraki birleştirmeler diğer taslağın sütununu değiştirmesin
+                self.columns[col] = copy.deepcopy(sketch)
+        return self
+
+    def __getitem__(self, col):
+        return self.columns[col]
+
+    def summary(self):
+        """describe()-like table of every numeric column."""
+        rows = {}
+        for col, s in self.columns.items():
+            q1, med, q3 = s.quantile([0.25, 0.5, 0.75]) if s.count else (np.nan,) * 3
+            rows[col] = {"count": s.count, "nulls": s.nulls, "mean": s.mean if s.count else np.nan, "std": s.std,
+                         "min": s.min, "25%": q1, "50%": med, "75%": q3, "max": s.max}
+        return pd.DataFrame(rows).T
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Modüller depo kökünden içe aktarılır (python -m pytest gibi düz pytest ile de)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def listing_chunks():
+    """Seeded synthetic listings in four chunks of 1500 rows."""
+    return list(generate(6000, seed=7, chunk_size=1500))
+
+
+@pytest.fixture(scope="session")
+def listings(listing_chunks):
+    return pd.concat(listing_chunks, ignore_index=True)
+
+
+@pytest.fixture(scope="session")
+def artifact(listings):
+    """Small forest artifact shared by tests that only read it."""
+    from model_store import train_artifact
+
+    return train_artifact(listings, {"n_estimators": 5, "max_depth": 8, "random_state": 0})
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from forest_engine import CompactForest
+from preprocessing import preprocess_data
+
+
+@pytest.fixture(scope="module")
+def features(listings):
+    X, y, _ = preprocess_data(listings)
+    return X.to_numpy(dtype=np.float32), y.to_numpy(dtype=float)
+
+
+@pytest.fixture(scope="module")
+def forest(features):
+    X, y = features
+    return RandomForestRegressor(n_estimators=20, max_depth=12, random_state=0).fit(X, y)
+
+
+def test_leaves_match_sklearn(forest, features):
+    X, _ = features
+    leaves = CompactForest.from_sklearn(forest).apply(X)
+    offsets = np.cumsum([0] + [t.tree_.node_count for t in forest.estimators_[:-1]])
+    for tree, offset, tree_leaves in zip(forest.estimators_, offsets, leaves):
+        np.testing.assert_array_equal(tree_leaves - offset, tree.apply(X))
+
+
+def test_forest_predictions_match_sklearn(forest, features):
+    X, _ = features
+    # Aynı yapraklar; yalnızca ağaç ortalamasının toplama sırası farklı olabilir
+    np.testing.assert_allclose(CompactForest.from_sklearn(forest).predict(X), forest.predict(X), rtol=1e-12)
+
+
+def test_single_tree_and_missing_values(features):
+    X, y = features
+    X = X.copy()
+    X[::7, 3] = np.nan
+    tree = DecisionTreeRegressor(max_depth=8, random_state=0).fit(X, y)
+    np.testing.assert_array_equal(CompactForest.from_sklearn(tree).predict(X), tree.predict(X))
+
+
+def test_quantized_leaves_error_bound(forest, features):
+    X, _ = features
+    engine = CompactForest.from_sklearn(forest, quantize_leaves=True)
+    values = np.concatenate([t.tree_.value[:, 0, 0] for t in forest.estimators_])
+    bound = (values.max() - values.min()) / 131070
+    assert np.abs(engine.predict(X) - forest.predict(X)).max() <= bound + 1e-9
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from incremental import refresh_artifact
+from model_store import predict_prices, train_artifact
+
+
+def test_refresh_gives_a_new_identity_and_still_predicts(listing_chunks):
+    history, new_rows = listing_chunks[0], listing_chunks[1]
+    artifact = train_artifact(history, {"n_estimators": 6, "max_depth": 6, "random_state": 0})
+    model_id, fingerprint = artifact["model_id"], artifact["fingerprint"]
+
+    refresh_artifact(artifact, new_rows, n_new_trees=2)
+
+    assert artifact["model_id"] != model_id
+    assert artifact["fingerprint"] != fingerprint
+    # Ağaç sayısı sabit kalır: eklenen her ağaç en eskisini emekliye ayırır
+    assert len(artifact["model"].estimators_) == 6
+    prices = predict_prices(artifact, new_rows.head(50))
+    assert prices.shape == (50,) and np.isfinite(prices).all()
+    # Kompakt motor yenilenmiş ormanla aynı tahminleri vermeli
+    X = artifact["pipeline"].transform(new_rows.head(50))
+    np.testing.assert_allclose(artifact["engine"].predict(X), artifact["model"].predict(X), rtol=1e-5)
+    # Yeni ilanlar konum dizinine eklenir
+    assert len(artifact["index"].listings) == len(history) + len(new_rows)
+
+
+def test_refresh_rejects_boosting(listing_chunks):
+    artifact = train_artifact(listing_chunks[0], {"backend": "boosting", "max_iter": 5})
+    with pytest.raises(ValueError):
+        refresh_artifact(artifact, listing_chunks[1])
@@ -0,0 +1,51 @@
+import threading
+
+from jobs import JobScheduler, job_key
+
+
+def test_duplicate_submit_returns_the_same_job():
+    scheduler = JobScheduler(workers=2)
+    release = threading.Event()
+    calls = []
+
+    def fn(a, b, progress=None):
+        calls.append((a, b))
+        # İş, ikinci gönderim yapılana kadar çalışır durumda kalır
+        release.wait(5)
+        return a + b
+
+    key = job_key("sum", "fingerprint", {"a": 1})
+    first = scheduler.submit(key, fn, 1, 2)
+    second = scheduler.submit(key, fn, 1, 2)
+    assert first is second
+    release.set()
+    assert first.wait(5) and first.result == 3
+    # Bitmiş iş de yeniden çalıştırılmadan döner
+    assert scheduler.submit(key, fn, 1, 2) is first
+    assert calls == [(1, 2)]
+
+
+def test_job_key_depends_on_data_and_params():
+    key = job_key("price_model", "abc", {"n_estimators": 100})
+    assert key == job_key("price_model", "abc", {"n_estimators": 100})
+    assert key != job_key("price_model", "abd", {"n_estimators": 100})
+    assert key != job_key("price_model", "abc", {"n_estimators": 200})
+
+
+def test_failed_job_reruns_only_on_retry():
+    scheduler = JobScheduler(workers=1)
+    attempts = []
+
+    def flaky(progress=None):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("geçici hata")
+        return "ok"
+
+    failed = scheduler.submit("flaky", flaky)
+    failed.wait(5)
+    assert failed.status == "failed" and "geçici hata" in failed.error
+    assert scheduler.submit("flaky", flaky) is failed
+    retried = scheduler.submit("flaky", flaky, retry=True)
+    assert retried is not failed and retried.wait(5) and retried.result == "ok"
+    assert len(attempts) == 2
@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+
+import pytest
+
+from model_store import save_artifact, train_artifact
+from registry import City, CityRegistry, SizedLRU, StaleModelError
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = SizedLRU(max_bytes=100)
+    for key in "abc":
+        cache.get_or_load(key, lambda key=key: key.upper(), lambda _: 40)
+    # a, b ve c toplam 120 bayt; en eski a atılır
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    cache.get_or_load("b", lambda: "yeni", lambda _: 40)
+    cache.get_or_load("d", lambda: "D", lambda _: 40)
+    # b yeni kullanıldığı için c atılır
+    assert cache.get_or_load("b", lambda: "yeni", lambda _: 40) == "B"
+    assert cache.get_or_load("c", lambda: "yeniden", lambda _: 40) == "yeniden"
+
+
+def test_oversized_value_is_kept_alone():
+    cache = SizedLRU(max_bytes=100)
+    cache.get_or_load("small", lambda: 1, lambda _: 10)
+    cache.get_or_load("big", lambda: 2, lambda _: 500)
+    assert cache.stats()["entries"] == 1
+    assert cache.get_or_load("big", lambda: 3, lambda _: 500) == 2
+
+
+def test_concurrent_requests_load_once():
+    cache = SizedLRU(max_bytes=1000)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return "veri"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader, lambda _: 1)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["veri"] * 8
+    assert len(calls) == 1 and cache.misses == 1 and cache.hits == 7
+
+
+def make_registry(artifact_dir):
+    city = City("test", "Test", "unused.csv", str(artifact_dir), center=[40.7, -73.9])
+    return CityRegistry({"test": city})
+
+
+def test_model_follows_replaced_artifact(listings, tmp_path):
+    params = {"n_estimators": 3, "max_depth": 4, "random_state": 0}
+    old = train_artifact(listings, params)
+    save_artifact(old, str(tmp_path))
+    registry = make_registry(tmp_path)
+    assert registry.model("test", {"model_id": old["model_id"]})["model_id"] == old["model_id"]
+
+    # Başka bir iş modeli yeniden eğitip diskteki dosyayı değiştirir
+    new = train_artifact(listings, dict(params, random_state=1))
+    save_artifact(new, str(tmp_path))
+    # Kayıt geçici dosyalar üzerinden yapılır ve geride bir şey bırakmaz
+    assert not list(tmp_path.glob("*.tmp"))
+    # Önbellekteki eski model kendi kimliğiyle sunulmaya devam eder
+    assert registry.model("test", {"model_id": old["model_id"]})["model_id"] == old["model_id"]
+    # Önbellekte olmayan bir kimlik istenirse diskteki güncel model kendi kimliğiyle yüklenir
+    fresh = make_registry(tmp_path)
+    assert fresh.model("test", {"model_id": old["model_id"]})["model_id"] == new["model_id"]
+    assert ("model", "test", old["model_id"]) not in fresh.cache._entries
+
+
+def test_mismatched_model_is_never_cached(listings, tmp_path):
+    artifact = train_artifact(listings, {"n_estimators": 3, "max_depth": 4, "random_state": 0})
+    save_artifact(artifact, str(tmp_path))
+    # meta.json istenen modeli gösterirken diskteki dosya başka bir model (yarım kalmış bir kayıt gibi)
+    meta_path = tmp_path / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, model_id="baska-bir-model")))
+    registry = make_registry(tmp_path)
+    with pytest.raises(StaleModelError):
+        registry.model("test", {"model_id": "baska-bir-model"})
+    assert registry.cache.stats()["entries"] == 0
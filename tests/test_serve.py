@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from serve import MicroBatcher, validate_listing
+
+LISTING = {"latitude": 40.70161, "longitude": -73.94814, "minimum_nights": 1, "number_of_reviews": 7,
+           "reviews_per_month": 1.54, "calculated_host_listings_count": 1, "availability_365": 327,
+           "neighbourhood_group": "Brooklyn", "room_type": "Private room", "neighbourhood": "Williamsburg"}
+
+
+def fake_predict(df):
+    # Hatalı bir satır tüm toplu tahmini düşürür, gerçek pipeline'daki gibi
+    if (df["minimum_nights"] < 0).any():
+        raise ValueError("geçersiz satır")
+    return df["minimum_nights"].to_numpy(dtype=float) * 10
+
+
+def test_bad_request_only_fails_its_caller():
+    batcher = MicroBatcher(fake_predict, max_batch_size=64, max_wait_ms=200.0)
+    good = [dict(LISTING, minimum_nights=n) for n in (1, 2, 3)]
+    bad = dict(LISTING, minimum_nights=-1)
+    # Üç çağıran aynı mikro-toplu tahmine düşecek kadar kısa aralıkla gönderir
+    futures = [batcher.submit([good[0]]), batcher.submit([bad]), batcher.submit(good[1:])]
+
+    assert futures[0].result(5) == [10.0]
+    with pytest.raises(ValueError):
+        futures[1].result(5)
+    assert futures[2].result(5) == [20.0, 30.0]
+
+
+def test_concurrent_callers_are_batched():
+    batcher = MicroBatcher(fake_predict, max_batch_size=64, max_wait_ms=50.0)
+    results = [None] * 16
+
+    def call(i):
+        results[i] = batcher.predict([dict(LISTING, minimum_nights=i)], timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [[i * 10.0] for i in range(16)]
+    assert batcher.rows == 16 and batcher.batches < 16
+
+
+@pytest.mark.parametrize("changes", [{"latitude": float("nan")}, {"minimum_nights": True},
+                                     {"room_type": 3}, {"neighbourhood": 5}])
+def test_validate_listing_rejects_bad_fields(changes):
+    assert validate_listing(dict(LISTING, **changes)) is not None
+
+
+def test_validate_listing_reports_missing_fields():
+    listing = {k: v for k, v in LISTING.items() if k != "availability_365"}
+    assert "availability_365" in validate_listing(listing)
+    # neighbourhood isteğe bağlıdır; koordinatlardan bulunur
+    assert validate_listing(LISTING) is None
+    assert validate_listing(dict(LISTING, neighbourhood=None)) is None
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from stats import DatasetSketch
+
+COLUMNS = ["price", "minimum_nights", "number_of_reviews", "reviews_per_month", "availability_365"]
+
+
+def test_merge_matches_single_update(listing_chunks, listings):
+    single = DatasetSketch().update(listings)
+    merged = DatasetSketch()
+    for chunk in listing_chunks:
+        merged.merge(DatasetSketch().update(chunk))
+
+    assert merged.rows == single.rows == len(listings)
+    pd.testing.assert_series_equal(merged.nulls.sort_index(), single.nulls.sort_index())
+    assert set(merged.columns) == set(single.columns)
+    for col, expected in single.columns.items():
+        sketch = merged[col]
+        assert (sketch.count, sketch.nulls, sketch.min, sketch.max) == \
+            (expected.count, expected.nulls, expected.min, expected.max)
+        np.testing.assert_allclose([sketch.mean, sketch.std], [expected.mean, expected.std], rtol=1e-9)
+        # Kova sayıları toplanarak birleşir; sonuç tek geçişle birebir aynı olmalı
+        assert sketch.quantiles.positive == expected.quantiles.positive
+        assert sketch.quantiles.negative == expected.quantiles.negative
+        assert sketch.quantiles.zeros == expected.quantiles.zeros
+
+
+def test_moments_and_quantiles_match_pandas(listings):
+    sketch = DatasetSketch(COLUMNS).update(listings)
+    for col in COLUMNS:
+        values = listings[col].dropna().to_numpy(dtype=float)
+        s = sketch[col]
+        assert s.count == len(values) and s.nulls == listings[col].isna().sum()
+        np.testing.assert_allclose([s.mean, s.std], [values.mean(), values.std(ddof=1)], rtol=1e-9)
+        for q in (0.25, 0.5, 0.9):
+            # Göreli doğruluk garantisi: dönen değer o sıradaki gerçek değerin %1'i içinde
+            true = np.sort(values)[int(q * (len(values) - 1))]
+            assert abs(s.quantile(q) - true) <= s.quantiles.relative_accuracy * abs(true) + 1e-9
+
+
+def test_merge_does_not_alias_the_other_sketch(listing_chunks):
+    first = DatasetSketch(COLUMNS).update(listing_chunks[0])
+    merged = DatasetSketch().merge(first)
+    merged.merge(DatasetSketch(COLUMNS).update(listing_chunks[1]))
+    # Birleştirilen taslağın sütunları kopyalanmış olmalı; kaynak değişmez
+    assert first["price"].count == listing_chunks[0]["price"].count()
+    assert merged["price"].count == first["price"].count + listing_chunks[1]["price"].count()
@@ -0,0 +1,16 @@
+import time
+
+from tuning import prepare_folds, successive_halving
+
+
+def test_search_stops_at_the_budget(listings, tmp_path):
+    paths = prepare_folds(listings, "test", n_splits=2, cache_dir=str(tmp_path))
+    budget = 3.0
+    start = time.perf_counter()
+    # Son basamaktaki 2000 ağaçlı ormanlar bütçeyi kat kat aşar; çalışan fit'ler öldürülmeli
+    leaderboard, winners = successive_halving(paths, 2, n_candidates=3, eta=3, min_fraction=0.5, max_trees=2000,
+                                              budget=budget, n_workers=2)
+    elapsed = time.perf_counter() - start
+    # Pay: işçi süreçlerinin başlatılması ve sonlandırılması
+    assert elapsed < budget + 2.0
+    assert all(row["rung"] == 0 for row in leaderboard)
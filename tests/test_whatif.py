@@ -0,0 +1,37 @@
+import numpy as np
+
+from model_store import predict_prices, train_artifact
+from whatif import PredictionCache, cached_predict, sweep
+
+
+def test_cached_predict_matches_model(artifact, listings):
+    cache = PredictionCache()
+    rows = listings.head(20)
+    np.testing.assert_allclose(cached_predict(artifact, rows, cache), predict_prices(artifact, rows))
+    np.testing.assert_allclose(cached_predict(artifact, rows, cache), predict_prices(artifact, rows))
+    assert cache.misses == 20 and cache.hits == 20
+
+
+def test_cache_misses_after_model_changes(artifact, listings):
+    cache = PredictionCache()
+    rows = listings.head(10)
+    cached_predict(artifact, rows, cache)
+    # Aynı veriyle farklı parametrelerle eğitilen model aynı özellik vektörlerini üretir;
+    # önbellek eski modelin fiyatlarını döndürmemeli
+    retrained = train_artifact(listings, dict(artifact["params"], random_state=1), artifact["fingerprint"])
+    assert retrained["model_id"] != artifact["model_id"]
+    prices = cached_predict(retrained, rows, cache)
+    assert cache.hits == 0 and cache.misses == 20
+    np.testing.assert_allclose(prices, predict_prices(retrained, rows))
+
+
+def test_sweep_scores_every_combination(artifact, listings):
+    cache = PredictionCache()
+    base = listings.head(1)
+    grid = sweep(artifact, base, {"minimum_nights": np.arange(1, 6), "room_type": ["Private room", "Shared room"]},
+                 cache)
+    assert len(grid) == 10
+    np.testing.assert_allclose(grid["predicted_price"], predict_prices(artifact, grid.drop(columns="predicted_price")))
+    # Örtüşen ikinci tarama yalnızca yeni satırları puanlar
+    sweep(artifact, base, {"minimum_nights": np.arange(1, 8), "room_type": ["Private room", "Shared room"]}, cache)
+    assert cache.misses == 14 and cache.hits == 10
@@ -0,0 +1,193 @@
+"""Parallel training of the models compared on the "Model Sonuçları" page.
+
+Each model is fitted in its own process. The feature matrix is written once as
+a float32 .npy file and opened memory-mapped by the workers, so none of them
+receives a pickled copy. Cores left over after one process per model go to the
+forest's tree-level parallelism (n_jobs):
+
+    python training.py --data AB_NYC_2019.csv --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+import instrumentation
+from boosting import DEFAULT_PARAMS as BOOSTING_PARAMS, BoostingRegressor
+
+MODEL_SPECS = {
+    "Doğrusal Regresyon": (LinearRegression, {}),
+    "Karar Ağacı": (DecisionTreeRegressor, {"max_depth": 4, "random_state": 42}),
+    "Random Forest": (RandomForestRegressor, {"n_estimators": 100, "random_state": 42}),
+    "Gradient Boosting": (BoostingRegressor, BOOSTING_PARAMS),
+}
+DEFAULT_WORKERS = int(os.environ.get("TRAIN_WORKERS", os.cpu_count() or 1))
+
+
+class SharedArrays:
+    """float32 copies of arrays on disk, re-opened memory-mapped by worker processes."""
+
+    def __init__(self, directory=None):
+        self.directory = tempfile.mkdtemp(prefix="airbnb-train-", dir=directory)
+        self.paths = {}
+
+    def add(self, name, array):
+        path = os.path.join(self.directory, f"{name}.npy")
+        np.save(path, np.ascontiguousarray(array, dtype=np.float32))
+        self.paths[name] = path
+        return path
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _uses_float32(estimator_cls):
+    # Ağaç modelleri (ve kendi kutulamasını yapan boosting) zaten float32 ile çalışır;
+    # diğer modeller float64 kopya alır.
+    return estimator_cls.__module__.startswith(("sklearn.tree", "sklearn.ensemble", "boosting"))
+
+
+def fit_model(estimator_cls, params, X_train, y_train, X_test=None, n_jobs=1):
+    """Fit one model; returns (model, fit seconds, test predictions or None)."""
+    if not _uses_float32(estimator_cls):
+        X_train = np.asarray(X_train, dtype=np.float64)
+        y_train = np.asarray(y_train, dtype=np.float64)
+        X_test = None if X_test is None else np.asarray(X_test, dtype=np.float64)
+    params = dict(params)
+    if "n_jobs" in estimator_cls().get_params():
+        params.setdefault("n_jobs", n_jobs)
+    model = estimator_cls(**params)
+    start = time.perf_counter()
+    with instrumentation.span(f"fit:{estimator_cls.__name__}"):
+        model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    predictions = None if X_test is None else model.predict(X_test)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=None)
+    return model, fit_seconds, predictions
+
+
+def _fit_shared(estimator_cls, params, paths, n_jobs):
+    X_train = np.load(paths["X_train"], mmap_mode="r")
+    y_train = np.load(paths["y_train"], mmap_mode="r")
+    X_test = np.load(paths["X_test"], mmap_mode="r") if "X_test" in paths else None
+    return fit_model(estimator_cls, params, X_train, y_train, X_test, n_jobs)
+
+
+def _tree_jobs(specs, n_workers):
+    """Cores each model may use internally once every model has its own process."""
+    spare = max(n_workers - len(specs), 0)
+    parallel = [name for name, (cls, _) in specs.items() if "n_jobs" in cls().get_params()]
+    return {name: 1 + (spare // len(parallel) if name in parallel else 0) for name in specs}
+
+
+def scaled_progress(progress, start, end):
+    """Map a sub-step's 0..1 progress onto [start, end] of the caller's progress."""
+    if progress is None:
+        return None
+    return lambda fraction, message=None: progress(start + (end - start) * fraction, message)
+
+
+def fit_forest(params, X, y, progress=None, step=10):
+    """RandomForestRegressor grown step trees at a time with warm_start.
+
+    warm_start draws the seeds of the added trees as if the forest had been
+    built in one call, so the result is identical to a single fit; the steps
+    only let progress(fraction, message) report the trees completed.
+    """
+    params = dict(params)
+    n_estimators = params.pop("n_estimators", 100)
+    model = RandomForestRegressor(n_estimators=min(step, n_estimators), warm_start=True, **params)
+    while True:
+        model.fit(X, y)
+        if progress is not None:
+            progress(len(model.estimators_) / n_estimators, f"{len(model.estimators_)}/{n_estimators} ağaç")
+        if len(model.estimators_) >= n_estimators:
+            break
+        model.set_params(n_estimators=min(len(model.estimators_) + step, n_estimators))
+    model.set_params(warm_start=False)
+    return model
+
+
+@instrumentation.timed()
+def train_models(X_train, y_train, X_test=None, specs=None, n_workers=None, progress=None):
+    """Fit all specs concurrently.
+
+    Returns {name: {"model", "fit_seconds", "predictions"}}; predictions are
+    made on X_test inside the workers when it is given. progress(fraction,
+    message) is called as each model finishes.
+    """
+    specs = MODEL_SPECS if specs is None else specs
+    n_workers = DEFAULT_WORKERS if n_workers is None else max(1, n_workers)
+
+    if n_workers == 1:
+        X_train = np.asarray(X_train, dtype=np.float32)
+        y_train = np.asarray(y_train, dtype=np.float32)
+        X_test = None if X_test is None else np.asarray(X_test, dtype=np.float32)
+        results = {}
+        for name, (cls, params) in specs.items():
+            results[name] = fit_model(cls, params, X_train, y_train, X_test)
+            if progress is not None:
+                progress(len(results) / len(specs), f"{name} eğitildi")
+    else:
+        tree_jobs = _tree_jobs(specs, n_workers)
+        with SharedArrays() as shared:
+            shared.add("X_train", X_train)
+            shared.add("y_train", y_train)
+            if X_test is not None:
+                shared.add("X_test", X_test)
+            # Streamlit süreci çok iş parçacıklı olduğu için fork yerine spawn kullanılır
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(specs)), mp_context=context) as pool:
+                futures = {name: pool.submit(_fit_shared, cls, params, shared.paths, tree_jobs[name])
+                           for name, (cls, params) in specs.items()}
+                names = {future: name for name, future in futures.items()}
+                for done, future in enumerate(as_completed(names), 1):
+                    if progress is not None:
+                        progress(done / len(specs), f"{names[future]} eğitildi")
+                results = {name: future.result() for name, future in futures.items()}
+
+    return {name: {"model": model, "fit_seconds": fit_seconds, "predictions": predictions}
+            for name, (model, fit_seconds, predictions) in results.items()}
+
+
+def main():
+    from sklearn.metrics import mean_absolute_error
+    from sklearn.model_selection import train_test_split
+
+    from data_cache import load_dataset
+    from preprocessing import preprocess_data
+
+    parser = argparse.ArgumentParser(description="Karşılaştırma modellerini paralel eğitir.")
+    parser.add_argument("--data", default="AB_NYC_2019.csv")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    X, y, _ = preprocess_data(load_dataset(args.data))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    start = time.perf_counter()
+    trained = train_models(X_train, y_train, X_test, n_workers=args.workers)
+    wall = time.perf_counter() - start
+    for name, result in trained.items():
+        mae = mean_absolute_error(y_test, result["predictions"])
+        print(f"{name:>20}: fit {result['fit_seconds']:.2f} s, MAE {mae:.2f}")
+    print(f"{'toplam duvar saati':>20}: {wall:.2f} s ({args.workers} işçi)")
+
+
+if __name__ == "__main__":
+    main()
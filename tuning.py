@@ -0,0 +1,328 @@
+"""Budgeted hyperparameter search for the decision tree and the random forest.
+
+Successive halving: a sample of candidates from each model's search space is
+scored by K-fold cross-validated MAE on a small share of the training rows
+(and, for forests, a small number of trees). The best 1/eta of each model
+move up to the next rung with eta times the budget; the last rung uses all
+rows and --max-trees. Every (candidate, fold) fit is a task in a process
+pool, so the search uses all cores.
+
+The preprocessed matrix and the fold indices are written once to
+.cache/folds as .npy files and opened memory-mapped by every worker; later
+searches on the same dataset reuse them. When the wall-clock budget runs out
+pending fits are dropped, running ones are killed with their worker
+processes, and the winners are taken from the highest rung reached.
+
+The leaderboard is written to the artifact directory, and the best forest is
+refitted on the whole dataset and saved as the price model, which the app
+then serves (see model_store.serving_params). --budget covers the whole run:
+the search stops early enough to leave the estimated refit time, the refit
+gets fewer trees if what is left still falls short, and the report records
+search, refit and total seconds:
+
+    python tuning.py --data AB_NYC_2019.csv --budget 300 --workers 8
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import shutil
+import time
+from collections import defaultdict
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from training import DEFAULT_WORKERS, MODEL_SPECS, fit_model
+
+FOLD_CACHE_DIR = os.path.join(".cache", "folds")
+# Model adı -> (sınıf, hiperparametre ızgarası); ağaç sayısı ayrı bir bütçe olarak verilir
+SEARCH_SPACES = {
+    "Karar Ağacı": (DecisionTreeRegressor, {
+        "max_depth": [4, 6, 8, 10, 12, 16, None],
+        "min_samples_leaf": [1, 5, 10, 20, 50, 100],
+        "max_features": [None, 0.5, "sqrt"],
+    }),
+    "Random Forest": (RandomForestRegressor, {
+        "max_depth": [8, 12, 16, 24, None],
+        "min_samples_leaf": [1, 2, 5, 10],
+        "max_features": [1.0, 0.5, "sqrt"],
+    }),
+}
+MIN_TREES = 10
+MIN_ROWS = 200
+
+
+def prepare_folds(df, fingerprint, n_splits=3, seed=42, cache_dir=FOLD_CACHE_DIR):
+    """Preprocessed features, target and K-fold indices as .npy files; returns their paths.
+
+    Training indices of each fold are stored shuffled, so a prefix of them is a
+    random subsample. Files are reused when the dataset and split are unchanged.
+    """
+    key = hashlib.sha256(json.dumps([fingerprint, n_splits, seed]).encode("utf-8")).hexdigest()[:16]
+    directory = os.path.join(cache_dir, key)
+    names = ["X", "y"] + [f"{part}_{fold}" for fold in range(n_splits) for part in ("train", "valid")]
+    paths = {name: os.path.join(directory, f"{name}.npy") for name in names}
+    if os.path.isdir(directory):
+        return paths
+
+    from sklearn.model_selection import KFold
+
+    from preprocessing import preprocess_data
+
+    X, y, _ = preprocess_data(df)
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    np.save(os.path.join(tmp_dir, "X.npy"), np.ascontiguousarray(X.to_numpy(), dtype=np.float32))
+    np.save(os.path.join(tmp_dir, "y.npy"), np.ascontiguousarray(y.to_numpy(), dtype=np.float32))
+    rng = np.random.default_rng(seed)
+    for fold, (train, valid) in enumerate(KFold(n_splits, shuffle=True, random_state=seed).split(X)):
+        np.save(os.path.join(tmp_dir, f"train_{fold}.npy"), rng.permutation(train).astype(np.int32))
+        np.save(os.path.join(tmp_dir, f"valid_{fold}.npy"), valid.astype(np.int32))
+    # Dizin tamamlandıktan sonra yerine taşınır; yarım kalan yazım kullanılmaz
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return paths
+
+
+def sample_candidates(space, n, rng, baseline=None):
+    """Up to n distinct parameter dicts drawn from the grid space, baseline first if given."""
+    names = list(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*space.values())]
+    order = rng.permutation(len(grid))
+    candidates = [baseline] if baseline is not None else []
+    for i in order:
+        if len(candidates) >= n:
+            break
+        if grid[i] not in candidates:
+            candidates.append(grid[i])
+    return candidates
+
+
+def baseline_params(name):
+    """The app's current settings for the model, expressed on its search space's keys."""
+    cls, space = SEARCH_SPACES[name]
+    defaults = cls().get_params()
+    configured = MODEL_SPECS[name][1] if name in MODEL_SPECS else {}
+    return {key: configured.get(key, defaults[key]) for key in space}
+
+
+def rung_fractions(n_candidates, eta, min_fraction):
+    """Share of the training rows given to each rung; the last rung gets all of them."""
+    n_rungs = int(math.floor(math.log(max(n_candidates, 1), eta) + 1e-9)) + 1
+    return [max(eta ** (rung - n_rungs + 1), min_fraction) for rung in range(n_rungs)]
+
+
+def budgeted_params(estimator_cls, params, fraction, max_trees, seed):
+    params = dict(params, random_state=seed)
+    if "n_estimators" in estimator_cls().get_params():
+        params["n_estimators"] = max(MIN_TREES, int(round(max_trees * fraction)))
+    return params
+
+
+def _score_fold(estimator_cls, params, paths, fold, fraction):
+    """Validation MAE of one fit on the first fraction of a fold's training rows."""
+    X = np.load(paths["X"], mmap_mode="r")
+    y = np.load(paths["y"], mmap_mode="r")
+    train = np.load(paths[f"train_{fold}"])
+    valid = np.load(paths[f"valid_{fold}"])
+    train = np.sort(train[:max(MIN_ROWS, int(len(train) * fraction))])
+    _, fit_seconds, predictions = fit_model(estimator_cls, params, X[train], y[train], X[valid])
+    return float(np.mean(np.abs(predictions - y[valid]))), fit_seconds, len(train)
+
+
+def refit_estimate(row, n_rows, max_trees, n_splits):
+    """Expected seconds to refit a leaderboard row's forest on n_rows rows with max_trees trees.
+
+    Scales the row's mean per-fold fit time linearly with rows and trees.
+    """
+    trees = max_trees / row["n_estimators"] if row["n_estimators"] else 1.0
+    return row["fit_seconds"] / n_splits * n_rows / row["rows"] * trees
+
+
+def successive_halving(paths, n_splits, families=None, n_candidates=27, eta=3, min_fraction=0.02, max_trees=200,
+                       budget=600.0, n_workers=None, seed=42, progress=None, reserve_refit=False):
+    """Run the search; returns (leaderboard rows, {model: best row}).
+
+    Each leaderboard row is one candidate scored at one rung. When budget runs
+    out, pending fits are dropped and running ones killed with the worker
+    processes. With reserve_refit the search also stops early enough to leave
+    room for refitting the best forest on all rows (see refit_estimate).
+    progress(fraction, message), when given, is told how many rungs are done.
+    """
+    families = list(SEARCH_SPACES) if families is None else families
+    n_workers = DEFAULT_WORKERS if n_workers is None else max(1, n_workers)
+    rng = np.random.default_rng(seed)
+    alive = {name: sample_candidates(SEARCH_SPACES[name][1], n_candidates, rng, baseline_params(name))
+             for name in families}
+    fractions = rung_fractions(n_candidates, eta, min_fraction)
+    n_rows = len(np.load(paths["y"], mmap_mode="r"))
+    deadline = time.perf_counter() + budget
+    reserve = 0.0
+    leaderboard = []
+    best_rung = {}
+
+    # Streamlit süreci çok iş parçacıklı olabileceği için fork yerine spawn kullanılır. Bütçe bittiğinde
+    # çalışan fit'ler Pool.terminate ile öldürülür.
+    pool = multiprocessing.get_context("spawn").Pool(n_workers)
+    out_of_time = False
+    try:
+        for rung, fraction in enumerate(fractions):
+            if time.perf_counter() >= deadline - reserve:
+                break
+            done = queue.Queue()
+            tasks = {}
+            for name, candidates in alive.items():
+                cls = SEARCH_SPACES[name][0]
+                for i, params in enumerate(candidates):
+                    fit_params = budgeted_params(cls, params, fraction, max_trees, seed)
+                    for fold in range(n_splits):
+                        task = len(tasks)
+                        tasks[task] = (name, i)
+                        pool.apply_async(_score_fold, (cls, fit_params, paths, fold, fraction),
+                                         callback=lambda result, task=task: done.put((task, result, None)),
+                                         error_callback=lambda error, task=task: done.put((task, None, error)))
+            scores = defaultdict(list)
+            for _ in tasks:
+                try:
+                    task, result, error = done.get(timeout=max(deadline - reserve - time.perf_counter(), 0))
+                except queue.Empty:
+                    out_of_time = True
+                    break
+                if error is not None:
+                    raise error
+                scores[tasks[task]].append(result)
+
+            for name, candidates in alive.items():
+                rows = []
+                for i, params in enumerate(candidates):
+                    folds = scores.get((name, i), [])
+                    if len(folds) < n_splits:
+                        continue
+                    maes = [mae for mae, _, _ in folds]
+                    fit_params = budgeted_params(SEARCH_SPACES[name][0], params, fraction, max_trees, seed)
+                    rows.append({"model": name, "params": params, "rung": rung, "data_fraction": fraction,
+                                 "rows": folds[0][2], "n_estimators": fit_params.get("n_estimators"),
+                                 "cv_mae": float(np.mean(maes)), "cv_mae_std": float(np.std(maes)),
+                                 "fit_seconds": float(sum(s for _, s, _ in folds))})
+                if not rows:
+                    continue
+                rows.sort(key=lambda r: r["cv_mae"])
+                leaderboard.extend(rows)
+                best_rung[name] = rung
+                alive[name] = [r["params"] for r in rows[:max(1, math.ceil(len(candidates) / eta))]]
+                if reserve_refit and name == "Random Forest":
+                    reserve = refit_estimate(rows[0], n_rows, max_trees, n_splits)
+            if progress is not None:
+                progress((rung + 1) / len(fractions), f"Basamak {rung + 1}/{len(fractions)} tamamlandı")
+            if out_of_time:
+                break
+    finally:
+        # Sonuçları alınmış olsa da olmasa da işçiler beklenmeden sonlandırılır
+        pool.terminate()
+        pool.join()
+
+    leaderboard.sort(key=lambda r: (-r["rung"], r["cv_mae"]))
+    winners = {}
+    for row in leaderboard:
+        if row["rung"] == best_rung[row["model"]] and row["model"] not in winners:
+            winners[row["model"]] = row
+    return leaderboard, winners
+
+
+def tune(df, fingerprint=None, budget=600.0, n_splits=3, n_candidates=27, eta=3, max_trees=200, n_workers=None,
+         seed=42, artifact_dir=None, save=True, progress=None):
+    """Search, then refit the best forest on all rows and save it as the price model.
+
+    budget covers preparing the folds, the search and the refit; the search
+    keeps back the estimated refit time (see refit_estimate). Returns the
+    report that is also written next to the artifact.
+    """
+    from data_cache import dataset_fingerprint
+    from model_store import ARTIFACT_DIR, save_artifact, save_tuning, train_artifact
+
+    artifact_dir = ARTIFACT_DIR if artifact_dir is None else artifact_dir
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    start = time.perf_counter()
+    paths = prepare_folds(df, fingerprint, n_splits, seed)
+    leaderboard, winners = successive_halving(paths, n_splits, n_candidates=n_candidates, eta=eta,
+                                              max_trees=max_trees, budget=budget - (time.perf_counter() - start),
+                                              n_workers=n_workers, seed=seed, progress=progress, reserve_refit=save)
+    report = {
+        "fingerprint": fingerprint,
+        "search_seconds": time.perf_counter() - start,
+        "budget_seconds": budget,
+        "folds": n_splits,
+        "winner": min(winners.values(), key=lambda r: r["cv_mae"]) if winners else None,
+        "winners": winners,
+        "leaderboard": leaderboard,
+        "params": None,
+    }
+    forest = winners.get("Random Forest")
+    if save and forest is not None:
+        # Fiyat modeli bir orman olarak sunulur (motor, artımlı güncelleme); en iyi orman tam veriyle eğitilir
+        # Kalan bütçe tahmini yeniden eğitim süresine yetmiyorsa ağaç sayısı orantılı azaltılır
+        remaining = budget - (time.perf_counter() - start)
+        estimate = refit_estimate(forest, len(np.load(paths["y"], mmap_mode="r")), max_trees, n_splits)
+        trees = max_trees if estimate <= remaining else max(MIN_TREES, int(max_trees * max(remaining, 0) / estimate))
+        params = budgeted_params(RandomForestRegressor, forest["params"], 1.0, trees, seed)
+        refit_start = time.perf_counter()
+        save_artifact(train_artifact(df, params, fingerprint), artifact_dir)
+        report["params"] = params
+        report["refit_seconds"] = time.perf_counter() - refit_start
+        report["total_seconds"] = time.perf_counter() - start
+        save_tuning(report, artifact_dir)
+    return report
+
+
+def print_leaderboard(leaderboard, top=15):
+    print(f"{'model':<16} {'basamak':>7} {'satır':>7} {'ağaç':>5} {'CV MAE':>9} {'±':>6} {'fit s':>7}  parametreler")
+    for row in leaderboard[:top]:
+        trees = row["n_estimators"] or "-"
+        print(f"{row['model']:<16} {row['rung']:>7} {row['rows']:>7} {trees:>5} {row['cv_mae']:>9.2f} "
+              f"{row['cv_mae_std']:>6.2f} {row['fit_seconds']:>7.2f}  {json.dumps(row['params'])}")
+
+
+def main():
+    from data_cache import load_dataset
+    from model_store import ARTIFACT_DIR
+
+    parser = argparse.ArgumentParser(description="Karar ağacı ve Random Forest için ardışık yarılama ile "
+                                                 "hiperparametre araması yapar.")
+    parser.add_argument("--data", default="AB_NYC_2019.csv")
+    parser.add_argument("--budget", type=float, default=600.0, help="Arama için duvar saati bütçesi (s)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=27, help="Her model için başlangıç aday sayısı")
+    parser.add_argument("--eta", type=int, default=3, help="Her basamakta adayların 1/eta'sı kalır")
+    parser.add_argument("--max-trees", type=int, default=200, help="Son basamaktaki ağaç sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--no-save", action="store_true", help="Kazanan modeli artifact olarak kaydetme")
+    args = parser.parse_args()
+
+    df = load_dataset(args.data)
+    start = time.perf_counter()
+    report = tune(df, budget=args.budget, n_splits=args.folds, n_candidates=args.candidates, eta=args.eta,
+                  max_trees=args.max_trees, n_workers=args.workers, seed=args.seed, artifact_dir=args.artifact_dir,
+                  save=not args.no_save)
+    print_leaderboard(report["leaderboard"])
+    print(f"\nArama {report['search_seconds']:.1f} s (bütçe {args.budget:.0f} s), "
+          f"toplam {time.perf_counter() - start:.1f} s")
+    for name, row in report["winners"].items():
+        print(f"En iyi {name}: CV MAE {row['cv_mae']:.2f} {json.dumps(row['params'])}")
+    if report["params"] is not None:
+        print(f"Fiyat modeli kaydedildi: {args.artifact_dir} {json.dumps(report['params'])} "
+              f"(tam veriyle yeniden eğitim {report['refit_seconds']:.1f} s, "
+              f"toplam {report['total_seconds']:.1f} s / bütçe {args.budget:.0f} s)")
+
+
+if __name__ == "__main__":
+    main()
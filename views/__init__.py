@@ -0,0 +1,71 @@
+"""Page modules of the Streamlit app.
+
+Each page lives in its own module with a render(df, city, fingerprint)
+function; fingerprint is the dataset fingerprint computed when the data was
+loaded, the key of every per-dataset cache and job. Modules are
+imported the first time their page is opened, so the heavy libraries a page
+needs (sklearn, seaborn, matplotlib, folium) are not loaded on cold start.
+
+Model training runs as background jobs (see jobs.py); job_result shows their
+progress without blocking the session.
+"""
+import importlib
+
+import streamlit as st
+
+import instrumentation
+import jobs
+
+# Sayfa başlığı -> views altındaki modül adı (kenar çubuğu sırası)
+PAGES = {
+    "Ana Sayfa": "home",
+    "Veri İnceleme": "exploration",
+    "Ön İşleme Sonuçları": "preprocessing_results",
+    "Model Sonuçları": "model_results",
+    "Harita Görselleştirme": "map_view",
+    "Raporlama": "reporting",
+    "Fiyat Tahmin": "price_prediction",
+}
+
+
+def show_figure(fig):
+    with instrumentation.span("matplotlib_render"):
+        st.pyplot(fig)
+
+
+@st.fragment(run_every=1.0)
+def _job_progress(key):
+    job = jobs.get_scheduler().get(key)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{job.label}: {job.message}")
+    st.caption("Eğitim arka planda sürüyor; başka sayfalara geçebilirsiniz. "
+               "Aynı veri ve ayarlarla açılan diğer oturumlar da bu işin sonucunu kullanır.")
+
+
+def job_result(submit, wait=0.5):
+    """Result of the job returned by submit(retry=False), or None while it runs.
+
+    Jobs that finish within wait seconds render without a progress bar;
+    otherwise a fragment polls the job every second and reruns the page once
+    it is done.
+    """
+    job = submit(retry=False)
+    job.wait(wait)
+    if job.status == "done":
+        return job.result
+    if job.status == "failed":
+        st.error(f"{job.label} başarısız oldu: {job.error}")
+        if st.button("Tekrar Dene"):
+            submit(retry=True)
+            st.rerun()
+        return None
+    _job_progress(job.key)
+    return None
+
+
+def render(page, df, city, fingerprint):
+    """Import the page's module on first use and render it for city (a registry.City)."""
+    with instrumentation.span(f"import:{PAGES[page]}"):
+        module = importlib.import_module(f"views.{PAGES[page]}")
+    module.render(df, city, fingerprint)
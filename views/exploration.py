@@ -0,0 +1,69 @@
+"""Veri İnceleme: missing values and the reviews_per_month distribution."""
+import matplotlib.pyplot as plt
+import numpy as np
+import streamlit as st
+
+import instrumentation
+from plotting import sketch_histplot
+from preprocessing import FeaturePipeline
+from stats import DatasetSketch
+from views import show_figure
+
+
+@instrumentation.timed(cached=True)
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_eda_sketch(fingerprint, _df):
+    instrumentation.mark_cache(False)
+    # Keşif sayfalarının tüm özetleri tek geçişte bu taslaktan okunur
+    reviews = _df["reviews_per_month"].fillna(0).to_numpy(dtype=float)
+    # Dönüşüm, modelin eğitildiği pipeline'ın lambda ve momentleriyle yapılır
+    pipeline = FeaturePipeline().fit(_df)
+    derived = _df.assign(
+        reviews_filled=reviews,
+        reviews_yj=pipeline.transform_reviews(reviews),
+        minimum_nights_log=np.log1p(_df["minimum_nights"].to_numpy(dtype=float)),
+    )
+    columns = ["reviews_per_month", "reviews_filled", "reviews_yj", "minimum_nights", "minimum_nights_log"]
+    return DatasetSketch(columns=columns).update(derived)
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'>Veri İnceleme</h1>", unsafe_allow_html=True)
+    st.markdown("<h2 class='section-header'>Eksik Değer Analizi</h2>", unsafe_allow_html=True)
+
+    sketch = get_eda_sketch(fingerprint, df)
+    missing_vals = sketch.nulls
+    missing_cols = missing_vals[missing_vals > 0]
+
+    if len(missing_cols) > 0:
+        st.write("Eksik değer içeren sütunlar:")
+        st.write(missing_cols)
+    else:
+        st.success("Veri setinde eksik değer bulunmuyor.")
+    st.markdown("<h2 class='section-header'>Aylık Yorum Sayısı Analizi</h2>", unsafe_allow_html=True)
+
+    reviews = sketch["reviews_per_month"]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Ortalama", f"{reviews.mean:.2f}")
+    with col2:
+        st.metric("Medyan", f"{reviews.median:.2f}")
+
+    st.markdown("<div>", unsafe_allow_html=True)
+    st.markdown("""
+    Çarpık bir dağılım var. Çünkü ortalama > medyan olduğundan aylık yorum sayısı verisi sağa çarpık bir dağılıma sahiptir.
+    Çünkü verilerin çoğu düşük yorum sayısına sahipken, birkaç popüler ilanın çok yüksek yorum alması ortalamayı yukarı çekmektedir.
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sketch_histplot(ax, reviews, bins=50)
+    ax.set_title("Aylık Yorum Sayısı Dağılımı")
+    ax.set_xlabel("reviews_per_month")
+
+    show_figure(fig)
+
+    st.markdown("""
+    Daha fazla yorum sayısına sahip ilanlar ortalamayı yukarı çekiyor. 
+    Burada çarpıklığı azaltmam gerekiyor. Dağılımı dengeli hale getirmek gerekiyor.
+    """)
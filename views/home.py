@@ -0,0 +1,40 @@
+"""Ana Sayfa: project summary and dataset overview."""
+import streamlit as st
+
+
+def render(df, city, fingerprint):
+    st.markdown(f"<h1 class='main-header'>{city.name} Airbnb Fiyat Tahmini</h1>", unsafe_allow_html=True)
+
+    st.markdown("<div>", unsafe_allow_html=True)
+    st.markdown(f"""
+    Bu projede, {city.name} şehrindeki Airbnb kiralık dairelerin fiyatlarını tahmin etmek amacıyla regresyon modelleri geliştirilmiştir.
+    Amacımız, bir evi kiralamak isteyen birinin ödeyeceği fiyatı öngörebilmektir.
+    Bu doğrultuda, Doğrusal Regresyon, Karar Ağacı ve Random Forest modelleri uygulanmıştır.
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<h2 class='section-header'>Veri Seti Genel Bakış</h2>", unsafe_allow_html=True)
+    st.dataframe(df.head())
+    rows, cols = df.shape
+    st.markdown(f"""
+    Veri seti toplam **{rows} gözlem (satır)** ve **{cols} özellik (sütun)** içermektedir.  
+    """)
+    st.markdown("<h2 class='section-header'>Veri Seti Sütunları</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    - **id**: Airbnb ilanının benzersiz kimlik numarası
+    - **name**: İlanın adı veya açıklaması
+    - **host_id**: İlan sahibinin benzersiz kimlik numarası
+    - **host_name**: İlan sahibinin adı
+    - **neighbourhood_group**: İlanın bulunduğu büyük bölge (örneğin Manhattan, Brooklyn)
+    - **neighbourhood**: İlanın bulunduğu mahalle
+    - **latitude**: İlanın enlem (latitude) koordinatı
+    - **longitude**: İlanın boylam (longitude) koordinatı
+    - **room_type**: Konaklama türü (Örneğin: "Private room", "Entire home/apt", "Shared room")
+    - **price**: Gecelik konaklama ücreti (USD cinsinden)
+    - **minimum_nights**: Konaklama için belirlenen minimum gece sayısı
+    - **number_of_reviews**: İlanın aldığı toplam inceleme sayısı
+    - **last_review**: İlanın son inceleme tarihi
+    - **reviews_per_month**: Aylık ortalama inceleme sayısı
+    - **calculated_host_listings_count**: Aynı ev sahibinin toplam ilan sayısı
+    - **availability_365**: Yıl boyunca müsait olduğu gün sayısı (365 gün üzerinden)
+    """)
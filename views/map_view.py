@@ -0,0 +1,94 @@
+"""Harita Görselleştirme: location plots, density and cluster maps."""
+import matplotlib.pyplot as plt
+import streamlit as st
+import streamlit.components.v1 as components
+
+import instrumentation
+from maps import DENSITY_METRICS, cluster_map, density_map, map_html
+from plotting import figure_png, scatter
+from spatial import PYRAMID_ZOOMS, build_pyramid
+
+
+def folium_static(fig, height=500):
+    """Render folium map (or its already rendered HTML) in the page."""
+    html_data = fig if isinstance(fig, str) else map_html(fig)
+    components.html(html_data, height=height)
+
+
+# Önbellekler şehir sayısıyla büyümesin diye kayıt sayısı sınırlıdır
+@instrumentation.timed(cached=True)
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_location_png(fingerprint, hue, title, _df):
+    instrumentation.mark_cache(False)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    scatter(ax, _df.longitude, _df.latitude, hue=_df[hue])
+    ax.set_title(title)
+    return figure_png(fig)
+
+
+@instrumentation.timed(cached=True)
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_density_pyramid(fingerprint, _df):
+    instrumentation.mark_cache(False)
+    return build_pyramid(_df)
+
+
+@instrumentation.timed(cached=True)
+@st.cache_data(show_spinner="Harita hazırlanıyor...", max_entries=16)
+def get_map_html(fingerprint, layer, filters, view, _df):
+    instrumentation.mark_cache(False)
+    center, zoom_start = view
+    if layer == "cluster":
+        return map_html(cluster_map(_df, list(center), room_types=list(filters), zoom_start=zoom_start))
+    if layer == "density":
+        zoom, metric = filters
+        cells = get_density_pyramid(fingerprint, _df)[zoom]
+        return map_html(density_map(cells, list(center), metric, zoom_start=zoom_start))
+    raise ValueError(f"Bilinmeyen harita katmanı: {layer}")
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'>Harita Görselleştirme</h1>", unsafe_allow_html=True)
+    view = (tuple(city.center), city.zoom)
+
+    try:
+
+        st.markdown("<h2 class='section-header'>Semtlere Göre Konum Dağılımı</h2>", unsafe_allow_html=True)
+
+        # Nokta sayısı eşiği aşınca grafik yoğunluk görüntüsü olarak çizilir
+        st.image(get_location_png(fingerprint, "neighbourhood_group", 'Neighbourhood Group Location', df))
+
+
+        st.markdown("<h2 class='section-header'>Oda Tiplerine Göre Konum Dağılımı</h2>", unsafe_allow_html=True)
+
+        st.image(get_location_png(fingerprint, "room_type", 'Room type location per Neighbourhood Group', df))
+
+
+        st.markdown("<h2 class='section-header'>İlan Yoğunluğu Haritası</h2>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+        density_zoom = col1.select_slider("Izgara çözünürlüğü (zoom)", options=list(PYRAMID_ZOOMS), value=12)
+        density_metric = col2.selectbox("Ölçüt", list(DENSITY_METRICS), format_func=DENSITY_METRICS.get)
+
+        if st.button("Yoğunluk Haritasını Göster"):
+
+            # Tüm ilanlar önceden ızgara hücrelerine toplanır; örnekleme yapılmaz
+            html_data = get_map_html(fingerprint, "density", (density_zoom, density_metric), view, df)
+
+
+            folium_static(html_data, height=600)
+
+
+        st.markdown("<h2 class='section-header'>İlan Kümeleme Haritası</h2>", unsafe_allow_html=True)
+
+        room_type_options = sorted(df["room_type"].dropna().astype(str).unique())
+        selected_room_types = st.multiselect("Oda Tipi", room_type_options, default=room_type_options)
+
+        if st.button("Kümeleme Haritasını Göster"):
+
+            # Tüm ilanlar tarayıcıda kümelenir; HTML veri seti ve filtreye göre önbelleklenir
+            html_data = get_map_html(fingerprint, "cluster", tuple(selected_room_types), view, df)
+
+            folium_static(html_data, height=600)
+    except Exception as e:
+        st.error(f"Harita oluşturulurken bir hata oluştu: {e}")
@@ -0,0 +1,162 @@
+"""Model Sonuçları: metrics, plots and comparison of the trained models."""
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+import streamlit as st
+
+import jobs
+from evaluation import evaluate_models
+from model_store import read_tuning
+from views import job_result, show_figure
+
+
+def submit_evaluation(df, fingerprint, retry=False):
+    # Aynı veri seti için tüm oturumlar tek bir değerlendirme işini paylaşır
+    return jobs.get_scheduler().submit(jobs.job_key("evaluation", fingerprint), evaluate_models, df, fingerprint,
+                                       label="Model değerlendirmesi", retry=retry)
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'>Model Sonuçları</h1>", unsafe_allow_html=True)
+
+
+    if st.checkbox("Modelleri Göster", value=True):
+        # Sonuçlar veri seti + bölme tohumu + hiperparametrelere göre diskte önbelleklenir
+        evaluation = job_result(lambda retry: submit_evaluation(df, fingerprint, retry))
+        if evaluation is not None:
+            metrics = evaluation["metrics"]
+            figures = evaluation["figures"]
+
+            st.markdown("<h2 class='section-header'>Doğrusal Regresyon Sonuçları</h2>", unsafe_allow_html=True)
+
+            lr_mae, lr_mse, lr_rmse, lr_r2 = (metrics["Doğrusal Regresyon"][k] for k in ("MAE", "MSE", "RMSE", "R²"))
+
+            col1, col2, col3,col4 = st.columns(4)
+            col1.metric("MAE", f"{lr_mae:.2f}")
+            col2.metric("RMSE", f"{lr_rmse:.2f}")
+            col3.metric("MSE", f"{lr_mse:.2f}")
+            col4.metric("R²", f"{lr_r2:.4f}") 
+
+            st.image(figures["Doğrusal Regresyon"])
+
+
+            st.markdown("<h2 class='section-header'>Karar Ağacı Sonuçları</h2>", unsafe_allow_html=True)
+
+            dt_mae, dt_mse, dt_r2 = (metrics["Karar Ağacı"][k] for k in ("MAE", "MSE", "R²"))
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("MAE", f"{dt_mae:.2f}")
+            col2.metric("MSE", f"{dt_mse:.2f}")
+            col3.metric("R²", f"{dt_r2:.4f}")
+
+            st.image(figures["Karar Ağacı"])
+
+            if st.checkbox("Karar Ağacını Görselleştir"):
+                st.image(figures["Karar Ağacı ağaç"])
+
+
+            st.markdown("<h2 class='section-header'>Random Forest Sonuçları</h2>", unsafe_allow_html=True)
+
+            rf_mae, rf_mse, rf_r2 = (metrics["Random Forest"][k] for k in ("MAE", "MSE", "R²"))
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("MAE", f"{rf_mae:.2f}")
+            col2.metric("MSE", f"{rf_mse:.2f}")
+            col3.metric("R²", f"{rf_r2:.4f}")
+
+            st.image(figures["Random Forest"])
+
+            st.markdown("<h2 class='section-header'>Gradient Boosting Sonuçları</h2>", unsafe_allow_html=True)
+
+            gb_mae, gb_mse, gb_r2 = (metrics["Gradient Boosting"][k] for k in ("MAE", "MSE", "R²"))
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("MAE", f"{gb_mae:.2f}", f"{gb_mae - rf_mae:+.2f} (RF'e göre)", delta_color="inverse")
+            col2.metric("MSE", f"{gb_mse:.2f}")
+            col3.metric("R²", f"{gb_r2:.4f}")
+
+            st.image(figures["Gradient Boosting"])
+
+            fit_seconds = evaluation["fit_seconds"]
+            profiles = evaluation["profiles"]
+            rf, gb = profiles["Random Forest"], profiles["Gradient Boosting"]
+            st.caption(f"Histogram tabanlı gradient boosting, Random Forest'a göre "
+                       f"{fit_seconds['Random Forest'] / fit_seconds['Gradient Boosting']:.1f} kat hızlı eğitildi, "
+                       f"model {rf['size_mb'] / gb['size_mb']:.0f} kat küçük, tek satır tahmini "
+                       f"{gb['predict_ms']:.1f} ms (RF: {rf['predict_ms']:.1f} ms).")
+
+            st.markdown("<h2 class='section-header'>Model Karşılaştırması</h2>", unsafe_allow_html=True)
+
+            comparison_df = pd.DataFrame([{
+                'Model': name,
+                'MAE': m['MAE'],
+                'MSE': m['MSE'],
+                'R²': m['R²'],
+                'Eğitim (s)': fit_seconds[name],
+                'Tahmin (ms)': profiles[name]['predict_ms'],
+                'Boyut (MB)': profiles[name]['size_mb'],
+            } for name, m in metrics.items()])
+
+            comparison_df = comparison_df.set_index('Model')
+            st.dataframe(comparison_df.style
+                         .highlight_min(subset=['MAE', 'MSE', 'Eğitim (s)', 'Tahmin (ms)', 'Boyut (MB)'])
+                         .highlight_max(subset=['R²'])
+                         .format({'Eğitim (s)': '{:.2f}', 'Tahmin (ms)': '{:.2f}', 'Boyut (MB)': '{:.2f}'}))
+
+            st.markdown("<div>", unsafe_allow_html=True)
+            st.markdown(f"""
+            En düşük hatayı {comparison_df['MAE'].idxmin()} modeli vermiştir. 
+            R² değeri 1'e yakın olduğu için modelin açıklama gücü yüksektir.
+            """)
+
+            # tuning.py ile bu veri seti için arama yapıldıysa sonuç tablosu gösterilir
+            tuning = read_tuning(city.artifact_dir)
+            if tuning is not None and tuning.get("fingerprint") == fingerprint:
+                st.markdown("<h3 class='subsection-header'>Hiperparametre Araması</h3>", unsafe_allow_html=True)
+                leaderboard = pd.DataFrame([{
+                    "Model": row["model"],
+                    "Basamak": row["rung"],
+                    "Satır": row["rows"],
+                    "Ağaç": row["n_estimators"],
+                    "CV MAE": row["cv_mae"],
+                    "Parametreler": ", ".join(f"{k}={v}" for k, v in row["params"].items()),
+                } for row in tuning["leaderboard"]])
+                st.dataframe(leaderboard.head(20).style.format({"CV MAE": "{:.2f}"}, na_rep="-"))
+                if tuning.get("params"):
+                    st.caption(f"Fiyat tahmin modeli aramanın en iyi ormanıyla sunuluyor: {tuning['params']} "
+                               f"({tuning['folds']} katlı CV, arama {tuning['search_seconds']:.0f} s).")
+
+                                            # Korelasyon matrisi
+            st.markdown("<h2 class='section-header'>Korelasyon Matrisi</h2>", unsafe_allow_html=True)
+
+            # İşlenmiş veri ile hesaplanan korelasyon da değerlendirme önbelleğinden gelir
+            st.image(figures["corr"])
+
+            # Yorum
+            st.markdown("""
+            Korelasyon matrisi, değişkenler arasındaki ilişkileri göstermektedir. Fiyatla en güçlü pozitif korelasyon neighbourhood_encoded (mahalle ortalama fiyatı) ve reviews_per_month_original (yorum yoğunluğu) değişkenlerindedir. Ayrıca review_score ile number_of_reviews arasında beklenen şekilde yüksek bir ilişki vardır. Bu analiz, modele en çok katkı sağlayan değişkenleri belirlemek için önemlidir.
+            """)
+
+            st.markdown("<h3 class='subsection-header'>Kategorik Değişkenler ve Ortalama Fiyat</h3>", unsafe_allow_html=True)
+
+            categorical_cols = ["room_type", "neighbourhood_group"]
+            selected_cat = st.selectbox("İncelemek istediğiniz kategorik değişkeni seçin:", categorical_cols)
+
+            # Seçilen kategoriye göre ortalama fiyat
+            avg_price_by_cat = df.groupby(selected_cat, observed=True)["price"].mean().sort_values(ascending=False).reset_index()
+
+            fig, ax = plt.subplots(figsize=(8, 5))
+            sns.barplot(x="price", y=selected_cat, data=avg_price_by_cat, palette="magma", ax=ax)
+            ax.set_title(f"{selected_cat} kategorisine göre ortalama fiyat")
+            ax.set_xlabel("Ortalama Fiyat ($)")
+            ax.set_ylabel(selected_cat)
+            show_figure(fig)
+
+            # Açıklama
+            st.markdown(f"""
+            **{selected_cat}** değişkenine göre Airbnb fiyatlarının nasıl değiştiği yukarıdaki grafikte görülmektedir.
+
+            Bu grafik:
+            - Her bir kategori için **ortalama fiyat** değerini gösterir.
+            - Modelin `room_type` ve `neighbourhood_group` gibi değişkenlere neden önem verdiğini açıklar.
+            """)
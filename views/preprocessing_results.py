@@ -0,0 +1,104 @@
+"""Ön İşleme Sonuçları: effect of the Yeo-Johnson and log transforms."""
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from plotting import sketch_boxplot, sketch_histplot
+from views import show_figure
+from views.exploration import get_eda_sketch
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'>Ön İşleme Sonuçları</h1>", unsafe_allow_html=True)
+
+
+    st.markdown("<h2 class='section-header'>Yeo-Johnson Dönüşümü Sonuçları</h2>", unsafe_allow_html=True)
+
+    try:
+        sketch = get_eda_sketch(fingerprint, df)
+        reviews_temp = sketch["reviews_filled"]
+        reviews_transformed = sketch["reviews_yj"]
+
+        fig, axes = plt.subplots(1, 2, figsize=(16, 5))
+
+
+        sketch_histplot(axes[0], reviews_temp, bins=50, color='skyblue')
+        axes[0].set_title("Orijinal Veride Aylık Yorum Dağılımı")
+
+
+        sketch_histplot(axes[1], reviews_transformed, bins=50, color='lightgreen')
+        axes[1].set_title("Yeo-Johnson Dönüşüm Sonrası Dağılım")
+
+        plt.tight_layout()
+        show_figure(fig)
+
+
+        fig, ax = plt.subplots(1, 2, figsize=(12, 6))
+
+
+        sketch_boxplot(ax[0], reviews_transformed)
+        ax[0].set_title("Aylık Yorum Sayısı Dağılımı (Boxplot)")
+
+
+        sketch_histplot(ax[1], reviews_transformed, bins=30, label_lines=False)
+        ax[1].set_title("Aylık Yorum Sayısı Histogramı")
+
+        show_figure(fig)
+
+        st.markdown("<div>", unsafe_allow_html=True)
+        st.markdown("""
+        Aylık yorum sayısı değişkeni başlangıçta oldukça sağa çarpıktı.
+        Bu durum, az sayıda ilanın aşırı fazla yorum alması nedeniyle, ortalamanın yukarı çekilmesinden kaynaklanıyordu.
+        Yeo-Johnson dönüşümü ile bu dağılım daha simetrik ve normal benzeri bir yapıya dönüştürüldü.
+        Böylece hem uç değerlerin etkisi azaldı, hem de regresyon modellerinin doğruluğu artırılmış oldu.
+
+
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"Dönüşüm sırasında hata oluştu: {e}")
+
+
+    st.markdown("<h2 class='section-header'>Eksik Değer Doldurma Stratejisi</h2>", unsafe_allow_html=True)
+
+    st.markdown("""
+    Eksik değerleri şu stratejiye göre doldurdum:
+
+    --Bu sütunlar ("id", "name", "host_id", "host_name", "last_review") analiz için gereksiz sutünlarımı verimden attım.
+    1. Aynı mahalle ve oda tipindeki medyan değerleri kullanarak eksik değerleri doldurdum.Çünkü benzer özellikteki evlerin benzer yorum alma ihtimali yüksek
+    2. Hala eksik değer varsa, mahalle bazında medyan değerleri kullandım.
+    3. Son olarak, kalan eksik değerleri 0 ile doldurdum.
+    """)
+
+
+    st.markdown("<h2 class='section-header'>Kategorik Değişken Dönüşümü ve Özellik Mühendisliği</h2>", unsafe_allow_html=True)
+
+    st.markdown("""
+    1. neighbourhood_group ve room_type kategorik değişkenlerini one-hot encoding ile sayısal değerlere dönüştürdüm.
+    2. neighbourhood sütunu, 200'den fazla farklı mahalle ismi içeriyordu.
+    Bu değişkeni doğrudan modele vermek hem anlamlı olmaz hem de yüksek boyutluluğa sebep olurdu.
+    Bunun yerine, her mahallenin ortalama fiyatını hesaplayarak neighbourhood_encoded adlı yeni bir sayısal değişken oluşturdum.BU sayede artık mahalle ismi degil o mahallenin ortalam fiyat bilgisini çektik.
+    3. Sıfır fiyatlı ilanları veri setinden çıkardım.
+    4. Fiyat değişkenine log(1 + price) dönüşümü uyguladım.
+    Bu sayede fiyatlardaki çarpıklığı azalttım ve veriyi modellere daha uygun hale getirdim.
+    5. Minimum konaklama süresi ve yorum sayısı gibi değişkenlerde yüksek uç değerler bulunuyordu.
+    minimum_nights değişkenine log dönüşümü uygulayarak bu uç değerlerin etkisini azalttım.
+    6. reviews_per_month ile number_of_reviews’u çarparak yeni bir review_score değişkeni oluşturdum.
+    Bu yeni özellik, hem evin ne kadar aktif olduğunu hem de ne kadar uzun süredir platformda olduğunu yansıtarak model için daha bilgilendirici hale geldi.
+    """)
+    sketch = get_eda_sketch(fingerprint, df)
+
+    # Görselleştirme
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Orijinal minimum_nights dağılımı
+    sketch_histplot(axes[0], sketch["minimum_nights"], bins=50, color="skyblue", label_lines=False)
+    axes[0].set_title("Minimum Nights (Orijinal)")
+    axes[0].set_xlabel("minimum_nights")
+
+    # Log dönüşümlü minimum_nights dağılımı
+    sketch_histplot(axes[1], sketch["minimum_nights_log"], bins=50, color="lightgreen", label_lines=False)
+    axes[1].set_title("Minimum Nights (Log Dönüşümlü)")
+    axes[1].set_xlabel("minimum_nights_log")
+
+    plt.tight_layout()
+    show_figure(fig)
@@ -0,0 +1,131 @@
+"""Fiyat Tahmin: price estimate and comparable listings for one listing."""
+import time
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+import jobs
+from model_store import ensure_artifact, serving_params
+from registry import get_registry
+from views import job_result, show_figure
+from whatif import CATEGORICAL_SWEEPS, SWEEP_GRIDS, cached_predict, prediction_cache, sweep, sweep_values
+
+SWEEP_LABELS = {
+    "availability_365": "Yıllık Müsaitlik (gün)",
+    "minimum_nights": "Minimum Konaklama Gecesi",
+    "number_of_reviews": "Yorum Sayısı",
+    "room_type": "Oda Tipi",
+    "neighbourhood_group": "Bölge",
+}
+
+
+def submit_price_model(df, city, fingerprint, retry=False):
+    # Model yalnızca veri seti değiştiğinde yeniden eğitilir; iş yalnızca meta veriyi döndürür,
+    # modelin kendisi şehir önbelleğinden yüklenir.
+    # tuning.py ile ayarlanmış hiperparametreler varsa onlar kullanılır
+    params = serving_params(fingerprint, city.artifact_dir)
+    key = jobs.job_key("price_model", fingerprint, [city.artifact_dir, params])
+    return jobs.get_scheduler().submit(key, ensure_artifact, df, params=params, artifact_dir=city.artifact_dir,
+                                       fingerprint=fingerprint, label=f"Fiyat modeli ({city.name})", retry=retry)
+
+
+def plot_sweep(grid, features, current):
+    """Price curve(s) for one numeric axis, bars for a category, heatmap for two numeric axes."""
+    numeric = [f for f in features if f not in CATEGORICAL_SWEEPS]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    if len(features) == 2 and len(numeric) == 2:
+        table = grid.pivot(index=features[1], columns=features[0], values="predicted_price")
+        image = ax.imshow(table.to_numpy(), origin="lower", aspect="auto", cmap="magma",
+                          extent=[table.columns.min(), table.columns.max(), table.index.min(), table.index.max()])
+        fig.colorbar(image, ax=ax, label="Tahmini fiyat ($)")
+        ax.scatter([current[features[0]]], [current[features[1]]], color="cyan", marker="x", label="Girilen ilan")
+        ax.set_xlabel(SWEEP_LABELS[features[0]])
+        ax.set_ylabel(SWEEP_LABELS[features[1]])
+        ax.legend()
+    elif numeric:
+        x = numeric[0]
+        hue = next((f for f in features if f != x), None)
+        groups = grid.groupby(hue, sort=False) if hue else [(None, grid)]
+        for level, part in groups:
+            ax.plot(part[x], part["predicted_price"], label=level)
+        ax.axvline(current[x], color="gray", linestyle="dashed", label="Girilen değer")
+        ax.set_xlabel(SWEEP_LABELS[x])
+        ax.set_ylabel("Tahmini fiyat ($)")
+        ax.legend(title=SWEEP_LABELS.get(hue))
+    else:
+        if len(features) == 2:
+            table = grid.pivot(index=features[0], columns=features[1], values="predicted_price")
+        else:
+            table = grid.set_index(features[0])["predicted_price"]
+        table.plot.barh(ax=ax)
+        ax.set_ylabel(SWEEP_LABELS[features[0]])
+        ax.set_xlabel("Tahmini fiyat ($)")
+    return fig
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'> Airbnb Fiyat Tahmin Aracı</h1>", unsafe_allow_html=True)
+
+    meta = job_result(lambda retry: submit_price_model(df, city, fingerprint, retry))
+    if meta is None:
+        return
+    artifact = get_registry().model(city.key, meta)
+
+    st.markdown("<h2 class='section-header'>Bilgilerinizi Girin</h2>", unsafe_allow_html=True)
+
+    # Girişler
+    default_latitude, default_longitude = city.default_location
+    latitude = st.number_input("Latitude (Enlem)", value=default_latitude)
+    longitude = st.number_input("Longitude (Boylam)", value=default_longitude)
+    minimum_nights = st.number_input("Minimum Konaklama Gecesi", min_value=1, value=3)
+    number_of_reviews = st.number_input("Yorum Sayısı", min_value=0, value=10)
+    reviews_per_month = st.number_input("Aylık Ortalama Yorum", min_value=0.0, value=0.5)
+    availability_365 = st.slider("Yıllık Müsaitlik (gün)", 0, 365, 180)
+
+    neighbourhood_group = st.selectbox("Bölge", city.levels("neighbourhood_group", df))
+    room_type = st.selectbox("Oda Tipi", city.levels("room_type", df))
+
+    # Ham ilan satırı; özellikler eğitimdeki pipeline ile üretilir
+    input_df = pd.DataFrame([{
+        "latitude": latitude,
+        "longitude": longitude,
+        "minimum_nights": minimum_nights,
+        "number_of_reviews": number_of_reviews,
+        "reviews_per_month": reviews_per_month,
+        "calculated_host_listings_count": 1,
+        "availability_365": availability_365,
+        "neighbourhood_group": neighbourhood_group,
+        "room_type": room_type,
+    }])
+
+    # Mahalle ve ortalama fiyatı girilen koordinatlardan bulunur
+    index = artifact["index"]
+    neighbourhood = index.neighbourhoods(latitude, longitude)[0]
+    neighbourhood_encoded = artifact["pipeline"].encode_neighbourhood(pd.DataFrame({"neighbourhood": [neighbourhood]}))[0]
+    col1, col2 = st.columns(2)
+    col1.metric("Mahalle", neighbourhood)
+    col2.metric("Mahalle Ortalama Fiyatı", f"${neighbourhood_encoded:.2f}")
+    input_df["neighbourhood"] = neighbourhood
+
+    # Tahmin
+    if st.button("Tahmini Fiyatı Göster"):
+        prediction = cached_predict(artifact, input_df)[0]
+        st.success(f"Tahmini Gecelik Fiyat: **${prediction:.2f}**")
+
+    st.markdown("<h3 class='subsection-header'>Senaryo Analizi</h3>", unsafe_allow_html=True)
+    features = st.multiselect("Değiştirilecek özellikler (en fazla 2)", list(SWEEP_GRIDS) + list(CATEGORICAL_SWEEPS),
+                              format_func=SWEEP_LABELS.get, max_selections=2)
+    if features:
+        # Tüm ızgara tek matris olarak tek seferde tahmin edilir; görülen satırlar önbellekten gelir
+        hits, misses = prediction_cache.hits, prediction_cache.misses
+        start = time.perf_counter()
+        grid = sweep(artifact, input_df, {f: sweep_values(artifact, f) for f in features})
+        elapsed = time.perf_counter() - start
+        show_figure(plot_sweep(grid, features, input_df.iloc[0]))
+        st.caption(f"{len(grid)} senaryo {elapsed * 1000:.0f} ms içinde tahmin edildi "
+                   f"({prediction_cache.hits - hits} önbellekten, {prediction_cache.misses - misses} yeni).")
+
+    st.markdown("<h3 class='subsection-header'>Yakındaki Benzer İlanlar</h3>", unsafe_allow_html=True)
+    comparables = index.comparables(latitude, longitude, room_type, k=10)
+    st.dataframe(comparables.style.format({"price": "${:.0f}", "distance_km": "{:.2f} km"}))
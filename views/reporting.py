@@ -0,0 +1,28 @@
+"""Raporlama: conclusions of the project."""
+import streamlit as st
+
+
+def render(df, city, fingerprint):
+    st.markdown("<h1 class='main-header'>📊Proje Raporlaması</h1>", unsafe_allow_html=True)
+
+
+
+
+
+
+    st.markdown("<h2 class='section-header'> Sonuçlar ve Yorumlar</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    - En başarılı model: **Random Forest**, 
+    - Overfitting gözlemlenmemiştir (train ve test R² yakın)
+    - Modelin en önemli değişkenleri:
+        - `neighbourhood_encoded`: mahalle ortalama fiyatı
+        - `latitude`, `longitude`: konum bilgisi
+        - `room_type_Entire home/apt`: 
+    """)
+
+    st.markdown("<h2 class='section-header'> Çıkarımlar</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    - Lokasyon ve mahalle ortalamaları fiyat üzerinde en baskın faktörlerdir.
+    - Ev fiyatları üzerinde 'oda tipi', 'yorum_sayısı'  da etkilemektedir.
+    - Model, düşük fiyatlı evlerde daha başarılı tahmin yaparken, uç değerlerde sapmalar yaşanmıştır.
+    """)
@@ -0,0 +1,116 @@
+"""What-if sweeps over a listing's features.
+
+sweep varies one or two features of a single listing over a grid, builds
+every combination as one frame, runs it through the feature pipeline once and
+scores the whole matrix in a single batched predict. PredictionCache keeps
+recent (feature vector -> price) pairs, so repeated or overlapping sweeps, and
+the single prediction on the page, only score rows they have not seen.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from model_store import predict_features, resolve_neighbourhoods
+
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 50_000))
+
+# Sayısal özelliklerin tarama ızgaraları; kategorik özellikler pipeline'daki seviyeleri kullanır
+SWEEP_GRIDS = {
+    "availability_365": np.arange(0, 366, 5),
+    "minimum_nights": np.arange(1, 31),
+    "number_of_reviews": np.arange(0, 201, 5),
+}
+CATEGORICAL_SWEEPS = ("room_type", "neighbourhood_group")
+
+
+class PredictionCache:
+    """LRU cache of predicted prices keyed by the artifact's model_id and feature vector."""
+
+    def __init__(self, max_entries=PREDICTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def predict(self, artifact, X):
+        """Prices for transformed feature rows X, scoring only the rows not cached."""
+        prefix = artifact["model_id"].encode("ascii")
+        keys = [prefix + row.tobytes() for row in np.ascontiguousarray(X.to_numpy(dtype=np.float64))]
+        prices = np.empty(len(keys))
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                price = self._entries.get(key)
+                if price is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    prices[i] = price
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            prices[missing] = predict_features(artifact, X.iloc[missing])
+            with self._lock:
+                for i in missing:
+                    self._entries[keys[i]] = float(prices[i])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return prices
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+prediction_cache = PredictionCache()
+
+
+def cached_predict(artifact, listings, cache=None):
+    """predict_prices through the prediction cache."""
+    cache = prediction_cache if cache is None else cache
+    X = artifact["pipeline"].transform(resolve_neighbourhoods(artifact, listings))
+    return cache.predict(artifact, X)
+
+
+def sweep_values(artifact, feature):
+    """Grid of values swept for feature."""
+    if feature in SWEEP_GRIDS:
+        return SWEEP_GRIDS[feature]
+    if feature in CATEGORICAL_SWEEPS:
+        return np.array(artifact["pipeline"].category_levels_[feature], dtype=object)
+    raise ValueError(f"Taranamayan özellik: {feature}")
+
+
+def build_grid(base, axes):
+    """One row per combination of axes values, all other columns copied from base's first row.
+
+    The first axis varies slowest, so prices reshape to (len(axis_1), len(axis_2)).
+    """
+    names = list(axes)
+    values = [np.asarray(v) for v in axes.values()]
+    shape = tuple(len(v) for v in values)
+    positions = np.indices(shape).reshape(len(shape), -1)
+    n_rows = positions.shape[1]
+    grid = base.iloc[np.zeros(n_rows, dtype=int)].drop(columns=names, errors="ignore").reset_index(drop=True)
+    for name, v, pos in zip(names, values, positions):
+        grid[name] = v[pos]
+    return grid
+
+
+def sweep(artifact, base, axes, cache=None):
+    """Predicted price for every combination of axes ({feature: values}) applied to base.
+
+    base is a one-row listing frame. Returns the grid with a predicted_price
+    column; the neighbourhood is resolved once from base's coordinates.
+    """
+    cache = prediction_cache if cache is None else cache
+    base = resolve_neighbourhoods(artifact, base)
+    grid = build_grid(base, axes)
+    X = artifact["pipeline"].transform(grid)
+    grid["predicted_price"] = cache.predict(artifact, X)
+    return grid